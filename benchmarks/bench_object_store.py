@@ -0,0 +1,66 @@
+"""
+Compares the object-store backends on the workload that dominates repository
+metadata: many small JSON recipes and manifests.
+
+    python benchmarks/bench_object_store.py --objects 20000
+"""
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from datagit.storage import objects
+
+def make_objects(count: int):
+    items = []
+    for i in range(count):
+        content = json.dumps({"chunks": [hashlib.sha256(f"{i}:{j}".encode()).hexdigest() for j in range(4)]}).encode()
+        items.append((hashlib.sha256(content).hexdigest(), content))
+    return items
+
+def timed(label: str, results: dict, fn):
+    start = time.perf_counter()
+    value = fn()
+    results[label] = time.perf_counter() - start
+    return value
+
+def run(backend: str, items) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = Path(tmp)
+        store = objects.MemoryObjectStore() if backend == "memory" else objects.open_object_store(repo_path, backend)
+        hashes = [h for h, _ in items]
+
+        def put_all():
+            with store.batch():
+                for obj_hash, content in items:
+                    store.put("recipe", obj_hash, content)
+
+        timed("put", results, put_all)
+        timed("has (one by one)", results, lambda: [store.has("recipe", h) for h in hashes])
+        timed("has_many", results, lambda: store.has_many("recipe", hashes))
+        timed("get (one by one)", results, lambda: [store.get("recipe", h) for h in hashes])
+        timed("get_many", results, lambda: store.get_many("recipe", hashes))
+        timed("iterate", results, lambda: sum(1 for _ in store.iterate("recipe")))
+        store.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=10_000, help="Number of small objects to write and read.")
+    args = parser.parse_args()
+
+    items = make_objects(args.objects)
+    backends = ("loose", "sqlite", "memory")
+    all_results = {backend: run(backend, items) for backend in backends}
+
+    operations = list(all_results[backends[0]])
+    print(f"{args.objects} objects, seconds per operation over all objects\n")
+    print(f"{'operation':<18}" + "".join(f"{b:>10}" for b in backends))
+    for op in operations:
+        print(f"{op:<18}" + "".join(f"{all_results[b][op]:>10.3f}" for b in backends))
+
+if __name__ == "__main__":
+    main()
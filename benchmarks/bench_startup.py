@@ -0,0 +1,81 @@
+"""
+Measures the startup cost of CLI commands with `python -X importtime` and
+guards against regressions: metadata-only commands must not import the data
+libraries.
+
+    python benchmarks/bench_startup.py            # report
+    python benchmarks/bench_startup.py --check    # also fail on a regression
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Commands that only touch refs, manifests, recipes and settings, run in a fresh repository.
+METADATA_COMMANDS = [
+    ["log"],
+    ["view"],
+    ["status"],
+    ["config"],
+    ["du"],
+    ["log", "--help"],
+]
+HEAVY_MODULES = ("polars", "pyarrow")
+
+def run_command(args, cwd: Path, importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-m", "datagit.cli.main", *args],
+        cwd=cwd, capture_output=True, text=True, env={**os.environ, "COLUMNS": "120"},
+    )
+
+def parse_importtime(stderr: str):
+    """Returns the total self import time (microseconds) and the set of top-level packages imported."""
+    total, packages = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        total += int(self_us)
+        packages.add(name.split(".")[0])
+    return total, packages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Wall-clock runs per command.")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if a metadata command imports a data library.")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        run_command(["init"], repo)
+
+        print(f"{'command':<16}{'imports (ms)':>14}{'wall (ms)':>12}  heavy modules")
+        for command in METADATA_COMMANDS:
+            result = run_command(command, repo, importtime=True)
+            import_us, packages = parse_importtime(result.stderr)
+            heavy = sorted(p for p in HEAVY_MODULES if p in packages)
+
+            walls = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                run_command(command, repo)
+                walls.append(time.perf_counter() - start)
+
+            label = " ".join(command)
+            print(f"{label:<16}{import_us / 1000:>14.1f}{statistics.median(walls) * 1000:>12.1f}  {', '.join(heavy) or '-'}")
+            if heavy:
+                failures.append(label)
+
+    if args.check and failures:
+        print(f"\nRegression: {', '.join(failures)} imported {'/'.join(HEAVY_MODULES)}.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
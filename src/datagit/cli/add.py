@@ -4,9 +4,8 @@ from rich.console import Console
 
 # Import our refactored storage modules, including the new repository helpers
 from datagit.storage import repo as repo_utils
-from datagit.storage import core
-from datagit.storage import metadata
-from datagit.storage import repository
+from datagit.storage import worktree
+from datagit.storage import daemon
 
 console = Console()
 app = typer.Typer()
@@ -25,34 +24,30 @@ def add_command(file: str = typer.Argument(..., help="File to add to the staging
     if not file_path.exists():
         console.print(f"[red]Error: File not found at '{file_path}'[/red]")
         raise typer.Exit(1)
+    if repo_utils.relative_path(repo_path, file_path) is None:
+        console.print(f"[red]Error: '{file_path}' is not inside the repository.[/red]")
+        raise typer.Exit(1)
 
-    # Use a relative path for consistent tracking within the repository.
-    # This is critical for the schema cache to work correctly.
-    repo_root = repo_path.parent
-    relative_file_path = str(file_path.resolve().relative_to(repo_root.resolve()))
-
-    console.print(f"Processing '{relative_file_path}'...")
+    console.print(f"Processing '{file}'...")
 
     try:
-        # 1. Construct the Merkle Tree. We now pass the relative path, which is essential
-        # for the core engine to look up and manage the file's schema in the cache.
-        new_file_hash = core.construct_merkle_tree_for_file(repo_path, file_path, relative_file_path)
-
-        # 2. Get the file's hash from the last commit to check for changes.
-        old_file_hash = repository.get_file_hash_from_last_commit(repo_path, relative_file_path)
-
-        # 3. Compare the top-level hashes to detect changes. If the root of the new
-        # Merkle tree is identical to the old one, no data has changed.
-        if new_file_hash == old_file_hash:
+        # A running daemon has the data libraries loaded and may already know
+        # the file's hash; otherwise build the Merkle tree here.
+        try:
+            result = daemon.request(repo_path, "add", path=str(file_path.resolve()))
+        except RuntimeError as e:
+            raise IOError(e)
+        if result is not None:
+            relative_file_path, staged = result["path"], result["staged"]
+        else:
+            # Compare the root of the new Merkle tree with the last commit's: if they
+            # are identical, no data has changed. Otherwise the file is staged
+            # by recording its new blueprint hash in the index.
+            relative_file_path, _, staged = worktree.stage_file(repo_path, file_path)
+
+        if not staged:
             console.print(f"[cyan]No changes detected in '{relative_file_path}'. Already up to date.[/cyan]")
             return
-
-        # 4. If the hash is different, a change has occurred. Stage the file
-        # by recording its new blueprint hash in the index.
-        index = metadata.load_index(repo_path)
-        index[relative_file_path] = new_file_hash
-        metadata.save_index(repo_path, index)
-
         console.print(f"[green]Staged '{relative_file_path}' for commit.[/green]")
 
     except IOError as e:
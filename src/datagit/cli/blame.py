@@ -0,0 +1,99 @@
+import typer
+import json
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from datetime import datetime
+from typing import List, Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import repository
+from datagit.storage import blame
+
+console = Console()
+app = typer.Typer()
+
+@app.command("blame")
+def blame_command(
+    file: str = typer.Argument(..., help="The tracked file containing the row."),
+    key: str = typer.Option(..., "--key", help="The row to blame, as COLUMN=VALUE (e.g. id=123)."),
+    columns: Optional[List[str]] = typer.Option(None, "--column", help="A column to blame. Repeat for several; defaults to every column."),
+    at: Optional[str] = typer.Option(None, "--at", help="A view name or commit hash to start from. Defaults to the current HEAD."),
+    use_index: bool = typer.Option(True, "--index/--no-index", help="Keep the key lookups in the repository cache for faster repeated blames."),
+    output_format: str = typer.Option("table", "--format", help="Output format: 'table' or 'json'.")
+):
+    """
+    Shows which commit introduced the current values of a row.
+    Commits where the row's chunks didn't change are skipped without decoding anything.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    key_column, sep, key_value = key.partition("=")
+    if not sep or not key_column:
+        console.print(f"[red]Error: Expected --key COLUMN=VALUE, got '{key}'.[/red]")
+        raise typer.Exit(1)
+
+    start_commit = repository.resolve_ref(repo_path, at)
+    if not start_commit:
+        console.print(f"[yellow]No commits found for '{at or 'HEAD'}'.[/yellow]")
+        return
+
+    # Accept paths relative to the current directory, like `add` does.
+    file_path = Path(file)
+    if file_path.exists():
+        file = repo_utils.relative_path(repo_path, file_path)
+        if file is None:
+            console.print(f"[red]Error: '{file_path}' is not inside the repository.[/red]")
+            raise typer.Exit(1)
+
+    file_recipe_hash = repository.get_commit_file(repo_path, start_commit, file)
+    file_recipe = repository.get_recipe(repo_path, file_recipe_hash) if file_recipe_hash else None
+    if not file_recipe:
+        console.print(f"[red]Error: '{file}' is not tracked at {start_commit[:12]}.[/red]")
+        raise typer.Exit(1)
+    unknown = [name for name in [key_column, *(columns or [])] if name not in file_recipe.get("column_order", [])]
+    if unknown:
+        console.print(f"[red]Error: Unknown column(s) in '{file}': {', '.join(unknown)}[/red]")
+        console.print(f"Available columns: {', '.join(file_recipe.get('column_order', []))}")
+        raise typer.Exit(1)
+
+    try:
+        result = blame.blame_row(repo_path, start_commit, file, key_column, key_value, columns or None, use_index)
+    except IOError as e:
+        console.print(f"[red]Error reading history: {e}[/red]")
+        raise typer.Exit(1)
+
+    if result is None:
+        console.print(f"[yellow]No row with {key_column} = {key_value} in '{file}' at {start_commit[:12]}.[/yellow]")
+        return
+
+    if output_format == "json":
+        rows = [
+            {"column": name, "value": entry["value"], "commit": entry["commit"], "timestamp": entry["manifest"].get("timestamp"), "message": entry["manifest"].get("message")}
+            for name, entry in result["columns"].items()
+        ]
+        print(json.dumps({"row": result["row"], "columns": rows}, indent=2, default=str))
+        return
+
+    table = Table(title=f"Blame of {key_column} = {key_value} in '{file}' (row {result['row']})")
+    table.add_column("Column", style="cyan")
+    table.add_column("Value")
+    table.add_column("Commit", style="cyan", no_wrap=True)
+    table.add_column("Timestamp", style="magenta")
+    table.add_column("Message", style="green")
+
+    for name, entry in result["columns"].items():
+        timestamp_str = entry["manifest"].get("timestamp", "")
+        try:
+            formatted_ts = datetime.fromisoformat(timestamp_str).strftime("%Y-%m-%d %H:%M:%S %Z")
+        except (ValueError, TypeError):
+            formatted_ts = timestamp_str
+        label = f"{name} (row added)" if name == key_column else name
+        value = "" if entry["value"] is None else str(entry["value"])
+        table.add_row(label, value, entry["commit"][:12], formatted_ts, entry["manifest"].get("message", ""))
+    console.print(table)
+    console.print(f"Decoded {result['decoded_chunks']} chunk(s).")
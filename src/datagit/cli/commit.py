@@ -1,12 +1,10 @@
 import typer
 import json
-from pathlib import Path
 from datetime import datetime, timezone
 from rich.console import Console
 
 # Import our refactored storage modules
 from datagit.storage import repo as repo_utils
-from datagit.storage import core
 from datagit.storage import metadata
 from datagit.storage import repository
 
@@ -31,15 +29,14 @@ def commit_command(
         console.print("[yellow]Nothing to commit. Use 'datagit add <file>' to stage changes.[/yellow]")
         raise typer.Exit(1)
 
-    # 2. Create the Directory Recipe (the master blueprint for this commit)
-    dir_recipe_data = {"files": index}
-    dir_recipe_content = json.dumps(dir_recipe_data, sort_keys=True).encode()
-    dir_recipe_hash = core.save_object(repo_path, dir_recipe_content, "recipes")
-
-    # 3. Get the parent commit from the current active view's HEAD
+    # 2. Get the parent commit from the current active view's HEAD
     # This now correctly reads from the refs/heads files.
     parent_commit_hash = repository.get_head_commit(repo_path)
 
+    # 3. Create the Directory Recipe (the master blueprint for this commit):
+    # the parent's tree with the staged files applied, reusing unchanged directories.
+    dir_recipe_hash = repository.build_tree(repo_path, parent_commit_hash, index)
+
     # 4. Create the Manifest (the commit object)
     timestamp = datetime.now(timezone.utc).isoformat()
     manifest_data = {
@@ -49,7 +46,7 @@ def commit_command(
         "recipe": dir_recipe_hash
     }
     manifest_content = json.dumps(manifest_data, sort_keys=True).encode()
-    new_commit_hash = core.save_object(repo_path, manifest_content, "manifests")
+    new_commit_hash = repository.save_object(repo_path, manifest_content, "manifests")
 
     # 5. Update the current view to point to our new commit
     # This is the crucial step that moves the branch pointer forward.
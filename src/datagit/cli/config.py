@@ -0,0 +1,80 @@
+import typer
+import json
+from rich.console import Console
+from typing import Any, Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import metadata
+from datagit.storage import materialize, objects
+
+console = Console()
+app = typer.Typer()
+
+# Settings that only accept a fixed set of values.
+SETTING_CHOICES = {
+    "object_store": objects.OBJECT_STORE_BACKENDS,
+    "materialization_cache.link_mode": materialize.LINK_MODES,
+}
+
+def _validation_error(key: str, default: Any, value: Any) -> Optional[str]:
+    """Checks a new value against the setting's default; returns why it is invalid, if it is."""
+    if isinstance(default, dict):
+        return f"'{key}' is a group of settings; set them one at a time, e.g. '{key}.{next(iter(default))}'."
+    if key in SETTING_CHOICES:
+        if value not in SETTING_CHOICES[key]:
+            return f"'{key}' must be one of: {', '.join(SETTING_CHOICES[key])}."
+    elif isinstance(default, bool):
+        if not isinstance(value, bool):
+            return f"'{key}' must be true or false."
+    elif isinstance(default, int):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            return f"'{key}' must be a non-negative integer."
+    return None
+
+@app.command("config")
+def config_command(
+    key: Optional[str] = typer.Argument(None, help="A dotted setting name, e.g. 'materialization_cache.enabled'."),
+    value: Optional[str] = typer.Argument(None, help="The new value, parsed as JSON when possible (true, 1024, \"text\").")
+):
+    """
+    Shows or changes repository settings. Without arguments, prints every setting.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    config = metadata.load_config(repo_path)
+    if not key:
+        console.print_json(json.dumps(config))
+        return
+
+    # Walk the dotted path, only allowing settings that exist in the defaults.
+    *parents, leaf = key.split(".")
+    section = config
+    defaults = metadata.DEFAULT_CONFIG
+    for part in parents:
+        if not isinstance(defaults.get(part), dict):
+            console.print(f"[red]Error: Unknown setting '{key}'.[/red]")
+            raise typer.Exit(1)
+        section, defaults = section[part], defaults[part]
+    if leaf not in defaults:
+        console.print(f"[red]Error: Unknown setting '{key}'.[/red]")
+        raise typer.Exit(1)
+
+    if value is None:
+        console.print(json.dumps(section[leaf]))
+        return
+
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        parsed = value
+    error = _validation_error(key, defaults[leaf], parsed)
+    if error:
+        console.print(f"[red]Error: {error}[/red]")
+        raise typer.Exit(1)
+    section[leaf] = parsed
+    metadata.save_config(repo_path, config)
+    console.print(f"[green]Set '{key}' to {json.dumps(parsed)}.[/green]")
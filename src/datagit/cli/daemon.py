@@ -0,0 +1,87 @@
+import typer
+import subprocess
+import sys
+import time
+from rich.console import Console
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import daemon
+
+console = Console()
+app = typer.Typer()
+daemon_app = typer.Typer(help="Run a background process that keeps the repository warm for status, add and log.")
+app.add_typer(daemon_app, name="daemon")
+
+# How long `daemon start` waits for the background process to answer.
+START_TIMEOUT = 30.0
+
+def _find_repo_or_exit():
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+    return repo_path
+
+@daemon_app.command("start")
+def start_command(
+    foreground: bool = typer.Option(False, "--foreground", help="Run in this process instead of in the background."),
+    poll: bool = typer.Option(False, "--poll", help="Detect changes by polling instead of inotify."),
+    interval: float = typer.Option(daemon.DEFAULT_POLL_INTERVAL, "--interval", help="Seconds between polls with --poll.")
+):
+    """
+    Starts the daemon for this repository. While it runs, 'status', 'add' and
+    'log' are answered by it instead of re-reading everything from disk.
+    """
+    repo_path = _find_repo_or_exit()
+    if daemon.request(repo_path, "ping") is not None:
+        console.print("[yellow]The daemon is already running for this repository.[/yellow]")
+        return
+
+    if foreground:
+        console.print(f"Serving [cyan]{repo_path.parent}[/cyan] on {daemon.socket_path(repo_path)}")
+        try:
+            daemon.serve(repo_path, use_inotify=not poll, poll_interval=interval)
+        except RuntimeError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+        return
+
+    args = [sys.executable, "-m", "datagit.cli.main", "daemon", "start", "--foreground", "--interval", str(interval)]
+    if poll:
+        args.append("--poll")
+    with open(repo_path / daemon.LOG_NAME, "ab") as log_file:
+        subprocess.Popen(
+            args, cwd=repo_path.parent, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        info = daemon.request(repo_path, "ping")
+        if info is not None:
+            console.print(f"[green]Daemon started (pid {info['pid']}, watching with {info['watcher']}).[/green]")
+            return
+        time.sleep(0.1)
+    console.print(f"[red]Error: The daemon did not start. See {repo_path / daemon.LOG_NAME}.[/red]")
+    raise typer.Exit(1)
+
+@daemon_app.command("stop")
+def stop_command():
+    """Stops the daemon for this repository."""
+    repo_path = _find_repo_or_exit()
+    result = daemon.request(repo_path, "stop")
+    if result is None:
+        console.print("[yellow]No daemon is running for this repository.[/yellow]")
+        return
+    console.print(f"[green]Stopped the daemon (pid {result['pid']}).[/green]")
+
+@daemon_app.command("status")
+def status_command():
+    """Shows whether a daemon is running for this repository."""
+    repo_path = _find_repo_or_exit()
+    info = daemon.request(repo_path, "ping")
+    if info is None:
+        console.print("No daemon is running for this repository.")
+        return
+    console.print(f"Daemon running (pid {info['pid']}), watching {info['files']} files with {info['watcher']}.")
@@ -0,0 +1,113 @@
+import typer
+import json
+from rich.console import Console
+from rich.table import Table
+from typing import Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import repository
+from datagit.storage import du
+
+console = Console()
+app = typer.Typer()
+
+def format_size(num_bytes: int) -> str:
+    """Formats a byte count for display, e.g. 1.5 MiB."""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{num_bytes} B"
+
+@app.command("du")
+def du_command(
+    at: Optional[str] = typer.Option(None, "--at", help="Only account for the history of this view or commit. Defaults to every view."),
+    top: int = typer.Option(10, "--top", help="Number of files and columns to list, largest unique size first (0 lists all)."),
+    output_format: str = typer.Option("table", "--format", help="Output format: 'table' or 'json'.")
+):
+    """
+    Shows where the repository's storage goes: per commit, per file and per
+    column, the bytes referenced, the bytes no other commit, file or column
+    shares, and the overall deduplication ratio.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    start_commits = None
+    if at:
+        start_commit = repository.resolve_ref(repo_path, at)
+        if not start_commit:
+            console.print(f"[red]Error: Could not resolve '{at}' to a commit.[/red]")
+            raise typer.Exit(1)
+        start_commits = [start_commit]
+
+    try:
+        with console.status("Measuring objects..."):
+            report = du.disk_usage(repo_path, start_commits)
+    except IOError as e:
+        console.print(f"[red]Error reading history: {e}[/red]")
+        raise typer.Exit(1)
+
+    by_unique = lambda item: (-item[1]["unique"], -item[1]["referenced"])
+    files = sorted(report["files"].items(), key=by_unique)
+    columns = sorted(report["columns"].items(), key=by_unique)
+    if top > 0:
+        files, columns = files[:top], columns[:top]
+
+    if output_format == "json":
+        print(json.dumps({
+            "totals": report["totals"],
+            "commits": report["commits"],
+            "files": [{"file": path, **usage} for path, usage in files],
+            "columns": [{"file": path, "column": column, **usage} for (path, column), usage in columns],
+        }, indent=2))
+        return
+
+    totals = report["totals"]
+    if not totals["commits"]:
+        console.print("[yellow]No commits yet.[/yellow]")
+        return
+
+    table = Table(title="Storage per commit")
+    table.add_column("Commit", style="cyan", no_wrap=True)
+    table.add_column("Message", style="green")
+    table.add_column("Files", justify="right")
+    for heading in ("Logical", "Referenced", "Unique", "Shared"):
+        table.add_column(heading, justify="right")
+    for entry in report["commits"]:
+        table.add_row(
+            entry["commit"][:12], entry["message"], str(entry["files"]),
+            *[format_size(entry[key]) for key in ("logical", "referenced", "unique", "shared")]
+        )
+    console.print(table)
+
+    table = Table(title="Storage per file")
+    table.add_column("File", style="cyan")
+    table.add_column("Versions", justify="right")
+    for heading in ("Referenced", "Unique", "Shared"):
+        table.add_column(heading, justify="right")
+    for path, usage in files:
+        table.add_row(path, str(usage["versions"]), *[format_size(usage[key]) for key in ("referenced", "unique", "shared")])
+    console.print(table)
+
+    table = Table(title="Storage per column")
+    table.add_column("File", style="cyan")
+    table.add_column("Column", style="magenta")
+    for heading in ("Referenced", "Unique", "Shared"):
+        table.add_column(heading, justify="right")
+    for (path, column), usage in columns:
+        table.add_row(path, column, *[format_size(usage[key]) for key in ("referenced", "unique", "shared")])
+    console.print(table)
+
+    ratio = totals["dedup_ratio"]
+    console.print(
+        f"{totals['commits']} commits reference {totals['objects']} objects: "
+        f"{format_size(totals['logical'])} logical, {format_size(totals['reachable'])} stored"
+        + (f" (dedup ratio {ratio:.2f}x)." if ratio else ".")
+    )
+    if totals["unreachable"]:
+        console.print(f"[yellow]{format_size(totals['unreachable'])} in objects this history does not reference.[/yellow]")
@@ -0,0 +1,64 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing import Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import fsck
+
+console = Console()
+app = typer.Typer()
+
+# Problems listed per category before the rest are summarized.
+MAX_LISTED = 20
+
+@app.command("fsck")
+def fsck_command(
+    full: bool = typer.Option(False, "--full", help="Re-hash every chunk, including those verified by earlier runs."),
+    jobs: Optional[int] = typer.Option(None, "-j", "--jobs", help="Worker processes for re-hashing. Defaults to the number of CPUs.")
+):
+    """
+    Verifies the integrity of the repository: every object reachable from the
+    views or staged in the index must exist and hash to its name. Reports
+    missing, corrupt and dangling (unreferenced) objects.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    with console.status("Checking objects..."):
+        report = fsck.check_repository(repo_path, full=full, jobs=jobs)
+
+    checked = report["checked"]
+    console.print(
+        f"Checked {checked['manifest']} manifests, {checked['recipe']} recipes and {checked['chunk']} chunks "
+        f"({report['rehashed_chunks']} chunks re-hashed)."
+    )
+
+    for category, style in (("missing", "red"), ("corrupt", "red")):
+        problems = report[category]
+        if not problems:
+            continue
+        table = Table(title=f"{category.capitalize()} objects ({len(problems)})")
+        table.add_column("Type", style="magenta")
+        table.add_column("Hash", style=style)
+        table.add_column("Referenced by", style="cyan")
+        for obj_type, obj_hash, referrer in problems[:MAX_LISTED]:
+            table.add_row(obj_type, obj_hash, referrer)
+        console.print(table)
+        if len(problems) > MAX_LISTED:
+            console.print(f"... and {len(problems) - MAX_LISTED} more.")
+
+    if report["dangling"]:
+        console.print(f"[yellow]{len(report['dangling'])} dangling objects (not reachable from any view or the index):[/yellow]")
+        for obj_type, obj_hash in report["dangling"][:MAX_LISTED]:
+            console.print(f"  {obj_type} {obj_hash}")
+        if len(report["dangling"]) > MAX_LISTED:
+            console.print(f"  ... and {len(report['dangling']) - MAX_LISTED} more.")
+
+    if report["missing"] or report["corrupt"]:
+        console.print("[bold red]The repository has integrity errors.[/bold red]")
+        raise typer.Exit(1)
+    console.print("[green]No integrity errors found.[/green]")
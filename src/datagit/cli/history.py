@@ -0,0 +1,93 @@
+import typer
+import csv
+import json
+import sys
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from datetime import datetime
+from typing import Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import repository
+from datagit.storage import aggregates
+
+console = Console()
+app = typer.Typer()
+
+@app.command("history")
+def history_command(
+    file: str = typer.Argument(..., help="The tracked file to analyze."),
+    column: str = typer.Option(..., "--column", help="The column to aggregate."),
+    agg: str = typer.Option("count", "--agg", help=f"Comma-separated aggregates: {', '.join(aggregates.AGGREGATES)}."),
+    at: Optional[str] = typer.Option(None, "--at", help="A view name or commit hash to start from. Defaults to the current HEAD."),
+    output_format: str = typer.Option("table", "--format", help="Output format: 'table', 'csv' or 'json'.")
+):
+    """
+    Tracks aggregates of a column across every commit of a view's history.
+    Per-chunk results are cached, so only chunks never seen before are decoded.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    requested = [name.strip() for name in agg.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in aggregates.AGGREGATES]
+    if not requested or unknown:
+        console.print(f"[red]Error: Unknown aggregate(s): {', '.join(unknown) or '(none given)'}[/red]")
+        console.print(f"Available aggregates: {', '.join(aggregates.AGGREGATES)}")
+        raise typer.Exit(1)
+
+    start_commit = repository.resolve_ref(repo_path, at)
+    if not start_commit:
+        console.print(f"[yellow]No commits found for '{at or 'HEAD'}'.[/yellow]")
+        return
+
+    # Accept paths relative to the current directory, like `add` does.
+    file_path = Path(file)
+    if file_path.exists():
+        file = repo_utils.relative_path(repo_path, file_path)
+        if file is None:
+            console.print(f"[red]Error: '{file_path}' is not inside the repository.[/red]")
+            raise typer.Exit(1)
+
+    try:
+        series = aggregates.column_history(repo_path, start_commit, file, column, requested)
+    except IOError as e:
+        console.print(f"[red]Error reading history: {e}[/red]")
+        raise typer.Exit(1)
+
+    if not series:
+        console.print(f"[yellow]Column '{column}' of '{file}' does not appear in this history.[/yellow]")
+        return
+
+    if output_format in ("csv", "json"):
+        rows = [
+            {"commit": entry["commit"], "timestamp": entry["manifest"].get("timestamp"), **entry["values"]}
+            for entry in series
+        ]
+        if output_format == "json":
+            print(json.dumps(rows, indent=2, default=str))
+        else:
+            # Values (e.g. min/max of a string column) may hold commas, quotes or newlines.
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+
+    table = Table(title=f"History of '{column}' in '{file}'")
+    table.add_column("Commit", style="cyan", no_wrap=True)
+    table.add_column("Timestamp", style="magenta")
+    for name in requested:
+        table.add_column(name, justify="right")
+
+    for entry in series:
+        timestamp_str = entry["manifest"].get("timestamp", "")
+        try:
+            formatted_ts = datetime.fromisoformat(timestamp_str).strftime("%Y-%m-%d %H:%M:%S %Z")
+        except (ValueError, TypeError):
+            formatted_ts = timestamp_str
+        table.add_row(entry["commit"][:12], formatted_ts, *["" if entry["values"][n] is None else str(entry["values"][n]) for n in requested])
+    console.print(table)
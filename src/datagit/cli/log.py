@@ -1,5 +1,4 @@
 import typer
-from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from datetime import datetime
@@ -7,6 +6,7 @@ from datetime import datetime
 # Import our refactored storage modules
 from datagit.storage import repo as repo_utils
 from datagit.storage import repository
+from datagit.storage import daemon
 
 console = Console()
 app = typer.Typer()
@@ -21,11 +21,18 @@ def log_command():
         console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
         raise typer.Exit(1)
 
-    # 1. Get the current view and its head commit hash using the new repository logic
-    current_view = repository.get_current_view_name(repo_path)
-    current_commit_hash = repository.get_head_commit(repo_path)
-
-    if not current_commit_hash:
+    # 1. Get the current view and its history, from the daemon if one is running.
+    try:
+        result = daemon.request(repo_path, "log")
+    except RuntimeError:
+        result = None
+    if result is not None:
+        current_view, entries, missing_commit = result["view"], result["entries"], result["missing"]
+    else:
+        current_view = repository.get_current_view_name(repo_path)
+        entries, missing_commit = repository.read_log(repo_path, repository.get_head_commit(repo_path))
+
+    if not entries and not missing_commit:
         console.print(f"[yellow]No commits yet on view '{current_view}'.[/yellow]")
         return
 
@@ -35,30 +42,18 @@ def log_command():
     table.add_column("Message", style="green")
     table.add_column("Timestamp", style="magenta")
 
-    # 3. Traverse the commit history from the view's HEAD backwards
-    commit_count = 0
-    while current_commit_hash:
-        manifest = repository.get_manifest(repo_path, current_commit_hash)
-        
-        if not manifest:
-            console.print(f"[bold red]Error: Corrupted history. Could not find commit '{current_commit_hash}'.[/bold red]")
-            break
-
-        message = manifest.get("message", "No commit message")
-        timestamp_str = manifest.get("timestamp", "No timestamp")
-        
+    # 3. Add the commits, newest first
+    for entry in entries:
+        timestamp_str = entry["timestamp"]
         try:
             ts = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
             formatted_ts = ts.strftime("%Y-%m-%d %H:%M:%S %Z")
         except (ValueError, AttributeError):
             formatted_ts = timestamp_str
 
-        table.add_row(current_commit_hash, message, formatted_ts)
-        commit_count += 1
+        table.add_row(entry["commit"], entry["message"], formatted_ts)
 
-        # Move to the parent commit for the next iteration
-        current_commit_hash = manifest.get("parent")
-
-    if commit_count > 0:
+    if missing_commit:
+        console.print(f"[bold red]Error: Corrupted history. Could not find commit '{missing_commit}'.[/bold red]")
+    if entries:
         console.print(table)
-
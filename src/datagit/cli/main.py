@@ -1,23 +1,67 @@
+import sys
+from importlib import import_module
+from typing import Iterable
+
 import typer
-# Import the new and updated command modules
-from datagit.cli import init, add, commit, log, status, activate, view
 
 app = typer.Typer(
     help="DataGit - A novel, content-addressed version control system for datasets.",
     rich_markup_mode="markdown"
 )
 
-# Register each command module with the main application
-app.add_typer(init.app, name="")
-app.add_typer(add.app, name="")
-app.add_typer(commit.app, name="")
-app.add_typer(log.app, name="")
-# The new `activate` command replaces the old `checkout`
-app.add_typer(activate.app, name="")
-# The new `view` command for managing branches
-app.add_typer(view.app, name="")
-app.add_typer(status.app, name="") # Status is not yet fully implemented for the new model
+# Every command and the module under `datagit.cli` that defines it. Modules are
+# only imported when their command runs, so metadata-only commands like `log`
+# or `view` never pay for loading the data libraries (polars, pyarrow).
+COMMAND_MODULES = {
+    "init": "init",
+    "add": "add",
+    "commit": "commit",
+    "log": "log",
+    # The new `activate` command replaces the old `checkout`
+    "activate": "activate",
+    # The new `view` command for managing branches
+    "view": "view",
+    # Three-way merge of views
+    "merge": "merge",
+    "status": "status", # Status is not yet fully implemented for the new model
+    # SQL over any commit, read straight from the chunk store
+    "query": "query",
+    # Aggregates of a column across a view's history
+    "history": "history",
+    # The commits that introduced a row's current values
+    "blame": "blame",
+    # Repository settings
+    "config": "config",
+    # Integrity check of every reachable object
+    "fsck": "fsck",
+    # Storage used per commit, file and column
+    "du": "du",
+    # Background process serving status, add and log
+    "daemon": "daemon",
+}
+
+@app.callback()
+def callback():
+    """DataGit - A novel, content-addressed version control system for datasets."""
+
+def register_commands(module_names: Iterable[str]) -> None:
+    """Imports the given command modules and registers them with the main application."""
+    for module_name in dict.fromkeys(module_names):
+        module = import_module(f"datagit.cli.{module_name}")
+        app.add_typer(module.app, name="")
+
+def _modules_for(args: list) -> list:
+    # The first argument that isn't an option names the command. Without a
+    # known command (e.g. `datagit --help`), every command has to be listed.
+    command = next((arg for arg in args if not arg.startswith("-")), None)
+    if command in COMMAND_MODULES:
+        return [COMMAND_MODULES[command]]
+    return list(COMMAND_MODULES.values())
 
 def main():
     """The main entry point for the DataGit CLI application."""
+    register_commands(_modules_for(sys.argv[1:]))
     app()
+
+if __name__ == "__main__":
+    main()
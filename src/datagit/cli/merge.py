@@ -0,0 +1,117 @@
+import typer
+import json
+from datetime import datetime, timezone
+from rich.console import Console
+from rich.table import Table
+from typing import Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import core
+from datagit.storage import metadata
+from datagit.storage import repository
+from datagit.storage import merge
+
+console = Console()
+app = typer.Typer()
+
+@app.command("merge")
+def merge_command(
+    view_name: str = typer.Argument(..., help="The view to merge into the current view."),
+    message: Optional[str] = typer.Option(None, "-m", "--message", help="Message for the merge commit.")
+):
+    """
+    Merges another view into the current one. Files, columns and chunks changed
+    on only one side are combined by hash; rows are compared only where both
+    sides changed the same chunk.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    if metadata.load_index(repo_path):
+        console.print("[bold red]Error: You have staged changes.[/bold red]")
+        console.print("Please commit your changes before merging.")
+        raise typer.Exit(1)
+
+    current_view = repository.get_current_view_name(repo_path)
+    if not current_view:
+        console.print("[red]Error: You are in a 'detached' state. Activate a view before merging.[/red]")
+        raise typer.Exit(1)
+
+    view_file = repo_path / "refs" / "heads" / view_name
+    if not view_file.is_file():
+        console.print(f"[red]Error: View '{view_name}' does not exist.[/red]")
+        raise typer.Exit(1)
+
+    ours = repository.get_head_commit(repo_path)
+    theirs = repository.resolve_ref(repo_path, view_name)
+    if not theirs:
+        console.print(f"[yellow]View '{view_name}' has no commits. Nothing to merge.[/yellow]")
+        return
+
+    base = merge.find_merge_base(repo_path, ours, theirs) if ours else None
+    if base == theirs:
+        console.print(f"[cyan]Already up to date with '{view_name}'.[/cyan]")
+        return
+
+    ours_files = repository.get_commit_files(repo_path, ours)
+    if ours is None or base == ours:
+        # Nothing happened on our side since the views diverged: just move forward.
+        console.print(f"Fast-forwarding [cyan]'{current_view}'[/cyan] to [cyan]{theirs[:12]}[/cyan]...")
+        new_commit_hash = theirs
+        files = repository.get_commit_files(repo_path, theirs)
+    else:
+        console.print(f"Merging [cyan]'{view_name}'[/cyan] into [cyan]'{current_view}'[/cyan] (base: {base[:12] if base else 'none'})...")
+        files, conflicts, new_objects = merge.merge_commits(repo_path, base, ours, theirs)
+
+        if conflicts:
+            table = Table(title="Merge conflicts")
+            table.add_column("File", style="cyan")
+            table.add_column("Column", style="magenta")
+            table.add_column("Rows", style="red")
+            for conflict in conflicts:
+                rows = conflict["rows"]
+                if rows is None:
+                    rows_str = "all"
+                elif rows[1] is None:
+                    rows_str = f"{rows[0]}-end"
+                else:
+                    rows_str = f"{rows[0]}-{rows[1] - 1}"
+                table.add_row(conflict["file"], conflict["column"] or "(whole file)", rows_str)
+            console.print(table)
+            console.print("[bold red]Merge aborted: the views made conflicting changes. Nothing was written.[/bold red]")
+            raise typer.Exit(1)
+
+        merge.save_new_objects(repo_path, new_objects)
+
+        # Only the paths the merge changed on our side are rewritten in our tree.
+        changes = {path: files.get(path) for path in set(ours_files) | set(files) if ours_files.get(path) != files.get(path)}
+        dir_recipe_hash = repository.build_tree(repo_path, ours, changes)
+
+        manifest_data = {
+            "parent": ours,
+            # The second parent lets later merges find their merge base.
+            "merge_parent": theirs,
+            "message": message or f"Merge view '{view_name}' into '{current_view}'",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "recipe": dir_recipe_hash
+        }
+        manifest_content = json.dumps(manifest_data, sort_keys=True).encode()
+        new_commit_hash = repository.save_object(repo_path, manifest_content, "manifests")
+
+    # The view only moves once its files could be rebuilt, so it never points
+    # at a commit that can't be restored.
+    try:
+        core.reconstruct_working_directory(repo_path, {"files": files})
+        # Files the merge result no longer tracks would otherwise linger as untracked.
+        core.remove_working_files(repo_path, sorted(set(ours_files) - set(files)))
+    except Exception as e:
+        console.print(f"[bold red]An error occurred during file reconstruction: {e}[/bold red]")
+        console.print(f"View '{current_view}' was left unchanged; run 'datagit activate {current_view}' to restore its files.")
+        raise typer.Exit(1)
+
+    repository.update_current_view_head(repo_path, new_commit_hash)
+
+    console.print(f"[green]View '{current_view}' is now at '{new_commit_hash[:12]}'.[/green]")
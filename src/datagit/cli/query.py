@@ -0,0 +1,54 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing import Optional
+
+# Import our storage modules
+from datagit.storage import repo as repo_utils
+from datagit.storage import repository
+from datagit.storage import query
+
+console = Console()
+app = typer.Typer()
+
+@app.command("query")
+def query_command(
+    sql: str = typer.Argument(..., help="The SQL query. Every tracked file is a table, named after its path or file stem."),
+    at: Optional[str] = typer.Option(None, "--at", help="A view name or commit hash to query. Defaults to the current HEAD."),
+    output_format: str = typer.Option("table", "--format", help="Output format: 'table', 'csv' or 'json'.")
+):
+    """
+    Runs a SQL query against the files of any commit or view, straight from the
+    chunk store. Nothing is written to the working directory.
+    """
+    repo_path = repo_utils.find_repo()
+    if not repo_path:
+        console.print("[red]No DataGit repository found. Run 'datagit init' first.[/red]")
+        raise typer.Exit(1)
+
+    commit_hash = repository.resolve_ref(repo_path, at)
+    if not commit_hash:
+        console.print(f"[red]Error: Could not resolve '{at or 'HEAD'}' to a commit.[/red]")
+        raise typer.Exit(1)
+
+    context = query.build_sql_context(repo_path, commit_hash)
+    try:
+        result = context.execute(sql).collect()
+    except Exception as e:
+        console.print(f"[bold red]Query failed: {e}[/bold red]")
+        console.print(f"Available tables: {', '.join(sorted(context.tables())) or '(none)'}")
+        raise typer.Exit(1)
+
+    if output_format == "csv":
+        print(result.write_csv(), end="")
+        return
+    if output_format == "json":
+        print(result.write_json())
+        return
+
+    table = Table(title=f"Query result at {commit_hash[:12]} ({result.height} rows)")
+    for column_name in result.columns:
+        table.add_column(column_name)
+    for row in result.iter_rows():
+        table.add_row(*["" if value is None else str(value) for value in row])
+    console.print(table)
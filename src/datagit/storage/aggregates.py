@@ -0,0 +1,195 @@
+import base64
+import decimal
+import hashlib
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import polars as pl
+
+from datagit.storage import cache, codec, core, repository, stats
+
+# --- PER-CHUNK PARTIAL AGGREGATES ---
+# Chunks are content-addressed, so a partial aggregate computed for a chunk
+# hash is valid forever. Partials are cached by chunk hash and merged per
+# commit; a history of many commits only decodes chunks it has never seen.
+
+AGGREGATES = ("rows", "count", "nulls", "sum", "mean", "min", "max", "distinct")
+
+# Aggregates that the zone maps in column recipes already answer.
+ZONE_MAP_AGGREGATES = {"rows", "count", "nulls"}
+
+CACHE_NAME = "aggregates-v1"
+
+# HyperLogLog precision for the distinct sketch: 2**10 registers, ~3% error.
+HLL_PRECISION = 10
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+def _hll_registers(values: Iterable[Any]) -> bytearray:
+    registers = bytearray(HLL_REGISTERS)
+    for value in values:
+        h = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - HLL_PRECISION)
+        remainder = h & ((1 << (64 - HLL_PRECISION)) - 1)
+        rank = (64 - HLL_PRECISION) - remainder.bit_length() + 1
+        if rank > registers[index]:
+            registers[index] = rank
+    return registers
+
+def _hll_estimate(registers: bytes) -> int:
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / sum(2.0 ** -r for r in registers)
+    zeros = registers.count(0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * math.log(m / zeros)
+    return round(estimate)
+
+def compute_chunk_partial(series: pl.Series, with_sketch: bool = False) -> Dict[str, Any]:
+    """Computes the mergeable partial aggregates of a single chunk."""
+    rows, nulls = series.len(), series.null_count()
+    partial: Dict[str, Any] = {"rows": rows, "nulls": nulls, "count": rows - nulls, "sum": None, "min": None, "max": None}
+
+    comparable = stats.comparable_series(series)
+    if comparable is None:
+        return partial
+    values = comparable.drop_nulls()
+
+    if series.dtype == pl.Boolean:
+        partial["sum"] = int(values.sum())
+    elif series.dtype.is_integer():
+        # Widen before summing so large columns can't overflow.
+        partial["sum"] = values.cast(pl.Int128).sum()
+    elif series.dtype.is_numeric() or series.dtype.base_type() == pl.Decimal:
+        partial["sum"] = values.sum()
+    if values.len():
+        partial["min"], partial["max"] = values.min(), values.max()
+    if with_sketch:
+        partial["sketch"] = base64.b64encode(bytes(_hll_registers(values.to_list()))).decode("ascii")
+    return partial
+
+def merge_partials(partials: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combines partial aggregates of consecutive chunks into one."""
+    merged: Dict[str, Any] = {"rows": 0, "nulls": 0, "count": 0, "sum": None, "min": None, "max": None}
+    sketch: Optional[bytearray] = None
+    for partial in partials:
+        for key in ("rows", "nulls", "count"):
+            merged[key] += partial.get(key, 0)
+        if partial.get("sum") is not None:
+            merged["sum"] = partial["sum"] if merged["sum"] is None else merged["sum"] + partial["sum"]
+        if partial.get("min") is not None:
+            merged["min"] = partial["min"] if merged["min"] is None else min(merged["min"], partial["min"])
+        if partial.get("max") is not None:
+            merged["max"] = partial["max"] if merged["max"] is None else max(merged["max"], partial["max"])
+        if "sketch" in partial:
+            registers = base64.b64decode(partial["sketch"])
+            sketch = bytearray(registers) if sketch is None else bytearray(max(a, b) for a, b in zip(sketch, registers))
+    if sketch is not None:
+        merged["sketch"] = sketch
+    return merged
+
+def _from_comparable(value: Any, dtype: pl.DataType) -> Any:
+    """Turns a stored min/max/sum back into a value of the column's dtype."""
+    if value is None:
+        return None
+    if dtype.base_type() == pl.Decimal:
+        return decimal.Decimal(value).scaleb(-dtype.scale)
+    if dtype.base_type() in (pl.Date, pl.Datetime, pl.Duration, pl.Time):
+        return pl.Series([value]).cast(dtype).item()
+    return value
+
+def finalize(merged: Dict[str, Any], aggregates: Sequence[str], dtype: pl.DataType) -> Dict[str, Any]:
+    """Produces the requested aggregate values from a merged partial."""
+    result = {}
+    for name in aggregates:
+        if name in ("rows", "count", "nulls"):
+            result[name] = merged[name]
+        elif name == "sum":
+            result[name] = _from_comparable(merged["sum"], dtype) if dtype.base_type() == pl.Decimal else merged["sum"]
+        elif name == "mean":
+            total = _from_comparable(merged["sum"], dtype) if dtype.base_type() == pl.Decimal else merged["sum"]
+            result[name] = total / merged["count"] if total is not None and merged["count"] else None
+        elif name in ("min", "max"):
+            result[name] = _from_comparable(merged[name], dtype)
+        elif name == "distinct":
+            result[name] = _hll_estimate(merged["sketch"]) if "sketch" in merged else None
+    return result
+
+# --- HISTORY SERIES ---
+
+def get_column_recipe(repo_path: Path, file_recipe_hash: str, column: str) -> Optional[Dict[str, Any]]:
+    """Looks up the column recipe of `column` in a file recipe."""
+    file_recipe = repository.get_recipe(repo_path, file_recipe_hash)
+    if not file_recipe:
+        return None
+    for col_info in file_recipe.get("columns", []):
+        if col_info["name"] == column:
+            return repository.get_recipe(repo_path, col_info["recipe"])
+    return None
+
+def column_history(
+    repo_path: Path,
+    start_commit: Optional[str],
+    file_path: str,
+    column: str,
+    aggregates: Sequence[str],
+) -> List[Dict[str, Any]]:
+    """
+    Computes aggregates of one column for every commit in the history of
+    `start_commit` that contains the file, oldest first. Each entry holds the
+    commit hash, its manifest and the aggregate values.
+    """
+    needs_sketch = "distinct" in aggregates
+    zone_maps_suffice = set(aggregates) <= ZONE_MAP_AGGREGATES
+
+    # 1. Resolve the chunk lists of every commit. Column recipes shared between
+    # commits are only read once.
+    entries = []
+    recipes_by_file_hash: Dict[str, Optional[Dict[str, Any]]] = {}
+    for commit_hash, manifest in repository.iter_history(repo_path, start_commit):
+        file_recipe_hash = repository.get_commit_file(repo_path, commit_hash, file_path)
+        if not file_recipe_hash:
+            continue
+        if file_recipe_hash not in recipes_by_file_hash:
+            recipes_by_file_hash[file_recipe_hash] = get_column_recipe(repo_path, file_recipe_hash, column)
+        col_recipe = recipes_by_file_hash[file_recipe_hash]
+        if col_recipe is not None:
+            entries.append((commit_hash, manifest, col_recipe))
+    entries.reverse()
+
+    # 2. Fetch partials for every distinct chunk, decoding only cache misses.
+    partials: Dict[str, Dict[str, Any]] = {}
+    with cache.KeyValueCache(repo_path, CACHE_NAME) as partial_cache:
+        chunk_hashes = list(dict.fromkeys(h for _, _, r in entries for h in r["chunks"]))
+        cached = partial_cache.get_many(chunk_hashes)
+        computed = {}
+        for _, _, col_recipe in entries:
+            for i, chunk_hash in enumerate(col_recipe["chunks"]):
+                if chunk_hash in partials:
+                    continue
+                hit = cached.get(chunk_hash)
+                if hit is not None and (not needs_sketch or "sketch" in hit):
+                    partials[chunk_hash] = hit
+                elif zone_maps_suffice and i < len(col_recipe.get("stats", [])):
+                    zone_map = col_recipe["stats"][i]
+                    partials[chunk_hash] = {"rows": zone_map["rows"], "nulls": zone_map["nulls"], "count": zone_map["rows"] - zone_map["nulls"]}
+                else:
+                    chunk_series = core.load_chunk(repo_path, chunk_hash)
+                    if chunk_series is None:
+                        raise IOError(f"Missing chunk '{chunk_hash}'.")
+                    partials[chunk_hash] = computed[chunk_hash] = compute_chunk_partial(chunk_series, needs_sketch)
+        if computed:
+            partial_cache.put_many(computed)
+
+    # 3. Merge per commit.
+    results = []
+    for commit_hash, manifest, col_recipe in entries:
+        merged = merge_partials([partials[h] for h in col_recipe["chunks"]])
+        if "dtype" in col_recipe:
+            dtype = codec.dtype_from_descriptor(col_recipe["dtype"])
+        else:
+            # Recipes written before dtypes were recorded: look at the data itself.
+            first_chunk = core.load_chunk(repo_path, col_recipe["chunks"][0]) if col_recipe["chunks"] else None
+            dtype = first_chunk.dtype if first_chunk is not None else pl.Null
+        results.append({"commit": commit_hash, "manifest": manifest, "values": finalize(merged, aggregates, dtype)})
+    return results
@@ -0,0 +1,181 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from datagit.storage import cache, codec, core, repository, stats
+
+# --- ROW PROVENANCE ---
+# `blame` finds the commit that introduced each current value of one row. The
+# row is identified by a key column value, and the history is walked from the
+# newest commit backwards (first parents only, like `log`). Recipes make most
+# commits free to skip: an unchanged file recipe, column recipe or chunk hash
+# means the value can't have changed, so chunks are only decoded at the
+# commits where the chunk holding the row actually changed.
+#
+# Finding a key in a version of the key column uses the zone maps to rule out
+# chunks and a per-chunk index (key -> first row position) for the rest. Chunks
+# are content-addressed, so that index is valid forever and is persisted in
+# `.datagit/cache`; a chunk shared by many versions is indexed once.
+
+KEY_INDEX_CACHE_NAME = "blame-keys-v1"
+
+# A row's location in one version of a file: (chunk index, position in the chunk).
+Location = Tuple[int, int]
+
+class KeyLocator:
+    """Finds key values in column recipes and reads single cells, decoding as few chunks as possible."""
+
+    def __init__(self, repo_path: Path, use_index: bool = True):
+        self.repo_path = repo_path
+        self.index_cache = cache.KeyValueCache(repo_path, KEY_INDEX_CACHE_NAME) if use_index else None
+        self.key_indexes: Dict[str, Dict[str, int]] = {}
+        self.new_key_indexes: Dict[str, Dict[str, int]] = {}
+        self.chunks: Dict[str, pl.Series] = {}
+        self.decoded_chunks = 0
+
+    def _load_chunk(self, chunk_hash: str) -> pl.Series:
+        if chunk_hash not in self.chunks:
+            series = core.load_chunk(self.repo_path, chunk_hash)
+            if series is None:
+                raise IOError(f"Missing chunk '{chunk_hash}'.")
+            self.chunks[chunk_hash] = series
+            self.decoded_chunks += 1
+        return self.chunks[chunk_hash]
+
+    def _key_indexes(self, chunk_hashes: Sequence[str]) -> List[Dict[str, int]]:
+        """Returns the key index of every chunk, from memory, the persisted cache or by decoding it."""
+        missing = [h for h in dict.fromkeys(chunk_hashes) if h not in self.key_indexes]
+        if missing and self.index_cache is not None:
+            self.key_indexes.update(self.index_cache.get_many(missing))
+        for chunk_hash in missing:
+            if chunk_hash in self.key_indexes:
+                continue
+            comparable = stats.comparable_series(self._load_chunk(chunk_hash))
+            index: Dict[str, int] = {}
+            for position, value in enumerate(comparable.to_list() if comparable is not None else []):
+                if value is not None:
+                    index.setdefault(str(value), position)
+            self.key_indexes[chunk_hash] = self.new_key_indexes[chunk_hash] = index
+        return [self.key_indexes[h] for h in chunk_hashes]
+
+    def locate(self, key_recipe: Dict[str, Any], key_value: Any) -> Optional[Location]:
+        """Finds the first row whose key equals `key_value`, or None if there is none."""
+        if "dtype" not in key_recipe:
+            return None
+        literal = stats.to_stat_value(key_value, codec.dtype_from_descriptor(key_recipe["dtype"]))
+        if literal is None:
+            return None
+
+        chunk_stats = key_recipe.get("stats", [])
+        candidates = [
+            i for i in range(len(key_recipe["chunks"]))
+            if i >= len(chunk_stats) or stats.chunk_may_match(chunk_stats[i], "==", literal)
+        ]
+        indexes = self._key_indexes([key_recipe["chunks"][i] for i in candidates])
+        for i, index in zip(candidates, indexes):
+            position = index.get(str(literal))
+            if position is not None:
+                return i, position
+        return None
+
+    def value(self, chunk_hash: str, position: int) -> Any:
+        return self._load_chunk(chunk_hash)[position]
+
+    def close(self) -> None:
+        if self.index_cache is not None:
+            if self.new_key_indexes:
+                self.index_cache.put_many(self.new_key_indexes)
+            self.index_cache.close()
+
+def _column_recipe_hashes(repo_path: Path, file_recipe_hash: str) -> Dict[str, str]:
+    file_recipe = repository.get_recipe(repo_path, file_recipe_hash)
+    if not file_recipe:
+        raise IOError(f"Missing file recipe '{file_recipe_hash}'.")
+    recipes = {col_info["name"]: col_info["recipe"] for col_info in file_recipe.get("columns", [])}
+    return {name: recipes[name] for name in file_recipe.get("column_order", recipes) if name in recipes}
+
+def blame_row(
+    repo_path: Path,
+    start_commit: Optional[str],
+    file_path: str,
+    key_column: str,
+    key_value: Any,
+    columns: Optional[Sequence[str]] = None,
+    use_index: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Finds, for each of `columns` (default: every column) of the row whose
+    `key_column` equals `key_value`, the oldest commit since which the cell
+    has held its current value. The key column's own entry is the commit that
+    introduced the row. Returns None if the file or row doesn't exist at
+    `start_commit`; otherwise `row` (its row number there), `columns`
+    ({name: {value, commit, manifest}}) and the number of `decoded_chunks`.
+    """
+    locator = KeyLocator(repo_path, use_index)
+    try:
+        blame: Dict[str, Dict[str, Any]] = {}
+        traced: Dict[str, Dict[str, Any]] = {}
+        newer: Optional[Dict[str, Any]] = None
+        row = None
+
+        for commit_hash, manifest in repository.iter_history(repo_path, start_commit):
+            file_recipe_hash = repository.get_commit_file(repo_path, commit_hash, file_path)
+            if file_recipe_hash is None:
+                break
+            if newer is not None and file_recipe_hash == newer["file"]:
+                # The file is identical, so is every cell.
+                for name in traced:
+                    blame[name].update(commit=commit_hash, manifest=manifest)
+                continue
+
+            column_hashes = _column_recipe_hashes(repo_path, file_recipe_hash)
+            key_hash = column_hashes.get(key_column)
+            if key_hash is None:
+                break
+            if newer is not None and key_hash == newer["key"]:
+                location = newer["location"]
+            else:
+                location = locator.locate(repository.get_recipe(repo_path, key_hash), key_value)
+            if location is None:
+                break
+            chunk_index, position = location
+
+            if newer is None:
+                row = chunk_index * core.CHUNK_ROW_SIZE + position
+                names = list(columns) if columns is not None else list(column_hashes)
+                traced = {name: {} for name in names if name in column_hashes}
+
+            for name in list(traced):
+                column_hash = column_hashes.get(name)
+                state = traced[name]
+                if column_hash is None:
+                    del traced[name]
+                    continue
+                if column_hash == state.get("column") and location == newer["location"]:
+                    blame[name].update(commit=commit_hash, manifest=manifest)
+                    continue
+
+                chunks = repository.get_recipe(repo_path, column_hash)["chunks"]
+                if chunk_index >= len(chunks):
+                    del traced[name]
+                    continue
+                chunk_hash = chunks[chunk_index]
+                if chunk_hash != state.get("chunk") or location != newer["location"]:
+                    value = locator.value(chunk_hash, position)
+                    if newer is not None and value != blame[name]["value"]:
+                        del traced[name]
+                        continue
+                    blame.setdefault(name, {"value": value})
+                blame[name].update(commit=commit_hash, manifest=manifest)
+                state.update(column=column_hash, chunk=chunk_hash)
+
+            if not traced:
+                break
+            newer = {"file": file_recipe_hash, "key": key_hash, "location": location}
+    finally:
+        locator.close()
+
+    if row is None:
+        return None
+    return {"row": row, "columns": blame, "decoded_chunks": locator.decoded_chunks}
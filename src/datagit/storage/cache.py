@@ -0,0 +1,70 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+# --- PERSISTENT CACHES ---
+# Derived data (aggregates, indexes, verification results) lives under
+# `.datagit/cache`. Everything in there can be deleted at any time and is
+# rebuilt on demand. Caches are SQLite databases rather than JSON files
+# because they are keyed by object hash and can grow to millions of entries.
+
+CACHE_DIR_NAME = "cache"
+
+def get_cache_dir(repo_path: Path) -> Path:
+    """Returns the repository's cache directory, creating it if needed."""
+    cache_dir = repo_path / CACHE_DIR_NAME
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir
+
+class KeyValueCache:
+    """A persistent string -> JSON value mapping stored in `.datagit/cache/<name>.db`."""
+
+    def __init__(self, repo_path: Path, name: str):
+        self.path = get_cache_dir(repo_path) / f"{name}.db"
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Looks up many keys at once; missing keys are absent from the result."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        # SQLite limits the number of bound parameters per statement.
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(f"SELECT key, value FROM entries WHERE key IN ({placeholders})", batch)
+            found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """Stores many entries in a single transaction."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, sort_keys=True)) for key, value in items.items()],
+            )
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many({key: value})
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterates over every entry. Meant for small caches only."""
+        for key, value in self.connection.execute("SELECT key, value FROM entries"):
+            yield key, json.loads(value)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self.connection:
+            self.connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "KeyValueCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,310 @@
+import json
+import struct
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# --- CHUNK FORMAT ---
+# A typed chunk is laid out as:
+#
+#   MAGIC | header length (uint32, little-endian) | JSON header | section 0 | section 1 | ...
+#
+# The header records the column name, a dtype descriptor, the row count, the
+# encoding that was used and the byte size of every payload section. The
+# leading NUL byte of MAGIC can never start a legacy chunk, because those
+# always begin with the UTF-8 encoded column name.
+
+MAGIC = b"\x00DGC\x01"
+
+# A string chunk is dictionary-encoded when it has at most this fraction of distinct values.
+DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+
+# --- DTYPE DESCRIPTORS ---
+# Simple dtypes are described by their name; parameterized dtypes by a dict
+# carrying their parameters, so that they can be rebuilt exactly.
+
+SIMPLE_DTYPES = {
+    "Boolean": pl.Boolean,
+    "Int8": pl.Int8, "Int16": pl.Int16, "Int32": pl.Int32, "Int64": pl.Int64, "Int128": pl.Int128,
+    "UInt8": pl.UInt8, "UInt16": pl.UInt16, "UInt32": pl.UInt32, "UInt64": pl.UInt64,
+    "Float32": pl.Float32, "Float64": pl.Float64,
+    "String": pl.String, "Binary": pl.Binary,
+    "Date": pl.Date, "Time": pl.Time,
+    "Categorical": pl.Categorical,
+    "Null": pl.Null,
+}
+
+if hasattr(pl, "Float16"):
+    SIMPLE_DTYPES["Float16"] = pl.Float16
+
+# Physical Arrow types of the fixed-width dtypes, keyed by descriptor type.
+FIXED_WIDTH_ARROW_TYPES = {
+    "Int8": pa.int8(), "Int16": pa.int16(), "Int32": pa.int32(), "Int64": pa.int64(),
+    "UInt8": pa.uint8(), "UInt16": pa.uint16(), "UInt32": pa.uint32(), "UInt64": pa.uint64(),
+    "Float16": pa.float16(), "Float32": pa.float32(), "Float64": pa.float64(),
+    "Date": pa.int32(), "Time": pa.int64(), "Datetime": pa.int64(), "Duration": pa.int64(),
+}
+
+def dtype_to_descriptor(dtype: pl.DataType) -> Union[str, Dict[str, Any]]:
+    """Converts a Polars dtype into a JSON-serializable descriptor."""
+    if isinstance(dtype, pl.Datetime):
+        return {"type": "Datetime", "time_unit": dtype.time_unit, "time_zone": dtype.time_zone}
+    if isinstance(dtype, pl.Duration):
+        return {"type": "Duration", "time_unit": dtype.time_unit}
+    if isinstance(dtype, pl.Decimal):
+        return {"type": "Decimal", "precision": dtype.precision, "scale": dtype.scale}
+    if isinstance(dtype, pl.Enum):
+        return {"type": "Enum", "categories": dtype.categories.to_list()}
+    if isinstance(dtype, pl.Array):
+        return {"type": "Array", "inner": dtype_to_descriptor(dtype.inner), "size": dtype.size}
+    if isinstance(dtype, pl.List):
+        return {"type": "List", "inner": dtype_to_descriptor(dtype.inner)}
+    if isinstance(dtype, pl.Struct):
+        return {
+            "type": "Struct",
+            "fields": [{"name": f.name, "dtype": dtype_to_descriptor(f.dtype)} for f in dtype.fields],
+        }
+
+    for name, simple_dtype in SIMPLE_DTYPES.items():
+        if dtype == simple_dtype:
+            return name
+    raise TypeError(f"Unsupported column dtype: {dtype}")
+
+def dtype_from_descriptor(descriptor: Union[str, Dict[str, Any]]) -> pl.DataType:
+    """The inverse of `dtype_to_descriptor`."""
+    if isinstance(descriptor, str):
+        return parse_dtype(descriptor)
+
+    kind = descriptor["type"]
+    if kind == "Datetime":
+        return pl.Datetime(descriptor["time_unit"], descriptor["time_zone"])
+    if kind == "Duration":
+        return pl.Duration(descriptor["time_unit"])
+    if kind == "Decimal":
+        return pl.Decimal(descriptor["precision"], descriptor["scale"])
+    if kind == "Enum":
+        return pl.Enum(descriptor["categories"])
+    if kind == "Array":
+        return pl.Array(dtype_from_descriptor(descriptor["inner"]), descriptor["size"])
+    if kind == "List":
+        return pl.List(dtype_from_descriptor(descriptor["inner"]))
+    if kind == "Struct":
+        return pl.Struct({f["name"]: dtype_from_descriptor(f["dtype"]) for f in descriptor["fields"]})
+    raise TypeError(f"Unknown dtype descriptor: {descriptor}")
+
+def parse_dtype(value: Union[str, Dict[str, Any]]) -> pl.DataType:
+    """
+    Resolves a dtype from a descriptor or from a plain dtype name, as found in
+    schema caches and chunks written before descriptors existed (e.g. "Int64", "Utf8").
+    """
+    if isinstance(value, dict):
+        return dtype_from_descriptor(value)
+    if value in SIMPLE_DTYPES:
+        return SIMPLE_DTYPES[value]
+    return getattr(pl, value)
+
+def _descriptor_type(descriptor: Union[str, Dict[str, Any]]) -> str:
+    return descriptor if isinstance(descriptor, str) else descriptor["type"]
+
+# --- BIT PACKING ---
+
+def _pack_bits(flags: List[bool]) -> bytes:
+    """Packs booleans LSB-first into bytes, the same layout Arrow uses for bitmaps."""
+    packed = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+def _validity(series: pl.Series) -> bytes:
+    """An empty section when there are no nulls, otherwise a packed validity bitmap."""
+    if series.null_count() == 0:
+        return b""
+    return _pack_bits(series.is_not_null().to_list())
+
+def _validity_buffer(section: bytes) -> Optional[pa.Buffer]:
+    return pa.py_buffer(section) if section else None
+
+# --- ENCODERS ---
+
+def _fixed_width_bytes(series: pl.Series) -> bytes:
+    """Little-endian values of the series' physical representation, with nulls zeroed."""
+    physical = series.to_physical().fill_null(0)
+    if physical.dtype == pl.Int128:
+        return b"".join(v.to_bytes(16, "little", signed=True) for v in physical.to_list())
+
+    arr = physical.to_arrow()
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    width = arr.type.bit_width // 8
+    data = arr.buffers()[1]
+    return data.to_pybytes()[arr.offset * width:(arr.offset + len(arr)) * width]
+
+def _string_sections(values: List[Optional[Union[str, bytes]]]) -> Tuple[List[bytes], bool]:
+    """Encodes values as (offsets, data). Offsets are int32 unless the data is too large."""
+    encoded = [b"" if v is None else (v if isinstance(v, bytes) else v.encode("utf-8")) for v in values]
+    data = b"".join(encoded)
+    offsets = [0, *accumulate(len(v) for v in encoded)]
+    wide = len(data) > 2**31 - 1
+    offsets_bytes = struct.pack(f"<{len(offsets)}{'q' if wide else 'i'}", *offsets)
+    return [offsets_bytes, data], wide
+
+def _encode_strings(series: pl.Series) -> Tuple[str, List[bytes], Dict[str, Any]]:
+    values = series.cast(pl.String).to_list() if series.dtype != pl.Binary else series.to_list()
+    length = len(values)
+
+    if series.dtype != pl.Binary and length and series.n_unique() <= length * DICTIONARY_MAX_DISTINCT_RATIO:
+        # Dictionary values are kept in order of first appearance, which keeps the encoding deterministic.
+        dictionary: Dict[str, int] = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(0)
+            else:
+                codes.append(dictionary.setdefault(value, len(dictionary)))
+        code_format = "B" if len(dictionary) <= 2**8 else "H" if len(dictionary) <= 2**16 else "I"
+        dict_sections, wide = _string_sections(list(dictionary))
+        codes_bytes = struct.pack(f"<{length}{code_format}", *codes)
+        return "dictionary", [_validity(series), codes_bytes, *dict_sections], {
+            "code_width": struct.calcsize(code_format), "dictionary_size": len(dictionary), "wide": wide,
+        }
+
+    sections, wide = _string_sections(values)
+    return "plain", [_validity(series), *sections], {"wide": wide}
+
+def encode_series(series: pl.Series) -> bytes:
+    """
+    Encodes a Series into the typed chunk format. The encoding depends only on
+    the name, dtype and values of the series, so it can safely be used for hashing.
+    """
+    descriptor = dtype_to_descriptor(series.dtype)
+    kind = _descriptor_type(descriptor)
+    extra: Dict[str, Any] = {}
+
+    if kind == "Null":
+        encoding, sections = "null", []
+    elif kind == "Boolean":
+        encoding = "bitpacked"
+        sections = [_validity(series), _pack_bits(series.fill_null(False).to_list())]
+    elif kind in FIXED_WIDTH_ARROW_TYPES or kind in ("Decimal", "Int128"):
+        encoding, sections = "fixed", [_validity(series), _fixed_width_bytes(series)]
+    elif kind in ("String", "Binary", "Categorical", "Enum"):
+        encoding, sections, extra = _encode_strings(series)
+    elif kind in ("List", "Array"):
+        # Arrays are stored like lists; the fixed width is restored by the final cast.
+        list_series = series if kind == "List" else series.cast(pl.List(series.dtype.inner))
+        arr = list_series.to_arrow()
+        if isinstance(arr, pa.ChunkedArray):
+            arr = arr.combine_chunks()
+        lengths = list_series.list.len().fill_null(0).to_list()
+        offsets = [0, *accumulate(lengths)]
+        child = pl.from_arrow(arr.flatten()).alias("")
+        if not isinstance(child, pl.Series):
+            child = child.to_series()
+        encoding = "nested"
+        sections = [_validity(series), struct.pack(f"<{len(offsets)}q", *offsets), encode_series(child)]
+    elif kind == "Struct":
+        fields = series.struct.unnest()
+        encoding = "nested"
+        sections = [_validity(series), *(encode_series(fields.to_series(i)) for i in range(fields.width))]
+    else:
+        raise TypeError(f"Unsupported column dtype: {series.dtype}")
+
+    header = {
+        "name": series.name,
+        "dtype": descriptor,
+        "length": series.len(),
+        "encoding": encoding,
+        "sections": [len(s) for s in sections],
+        **extra,
+    }
+    header_bytes = json.dumps(header, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return b"".join([MAGIC, struct.pack("<I", len(header_bytes)), header_bytes, *sections])
+
+# --- DECODERS ---
+
+def is_typed_chunk(content: bytes) -> bool:
+    """Tells typed chunks apart from chunks written in the legacy text-based format."""
+    return content.startswith(MAGIC)
+
+def read_header(content: bytes) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Parses the header of a typed chunk and splits its payload into sections."""
+    start = len(MAGIC)
+    (header_len,) = struct.unpack_from("<I", content, start)
+    start += 4
+    header = json.loads(content[start:start + header_len])
+    position = start + header_len
+
+    sections = []
+    for size in header["sections"]:
+        sections.append(content[position:position + size])
+        position += size
+    return header, sections
+
+def _decode_strings(header: Dict[str, Any], sections: List[bytes], is_binary: bool) -> pa.Array:
+    length = header["length"]
+    wide = header.get("wide", False)
+    if is_binary:
+        arrow_type = pa.large_binary() if wide else pa.binary()
+    else:
+        arrow_type = pa.large_string() if wide else pa.string()
+
+    validity = _validity_buffer(sections[0])
+    if header["encoding"] == "plain":
+        return pa.Array.from_buffers(arrow_type, length, [validity, pa.py_buffer(sections[1]), pa.py_buffer(sections[2])])
+
+    code_type = {1: pa.uint8(), 2: pa.uint16(), 4: pa.uint32()}[header["code_width"]]
+    codes = pa.Array.from_buffers(code_type, length, [validity, pa.py_buffer(sections[1])])
+    dictionary = pa.Array.from_buffers(
+        arrow_type, header["dictionary_size"], [None, pa.py_buffer(sections[2]), pa.py_buffer(sections[3])]
+    )
+    return dictionary.take(codes)
+
+def _decode_to_arrow(header: Dict[str, Any], sections: List[bytes]) -> pa.Array:
+    descriptor = header["dtype"]
+    kind = _descriptor_type(descriptor)
+    length = header["length"]
+
+    if kind == "Null":
+        return pa.nulls(length)
+    if kind == "Boolean":
+        return pa.Array.from_buffers(pa.bool_(), length, [_validity_buffer(sections[0]), pa.py_buffer(sections[1])])
+    if kind in ("Decimal", "Int128"):
+        arrow_type = pa.decimal128(descriptor["precision"] or 38, descriptor["scale"]) if kind == "Decimal" else pa.decimal128(38, 0)
+        return pa.Array.from_buffers(arrow_type, length, [_validity_buffer(sections[0]), pa.py_buffer(sections[1])])
+    if kind in FIXED_WIDTH_ARROW_TYPES:
+        arrow_type = FIXED_WIDTH_ARROW_TYPES[kind]
+        return pa.Array.from_buffers(arrow_type, length, [_validity_buffer(sections[0]), pa.py_buffer(sections[1])])
+    if kind in ("String", "Binary", "Categorical", "Enum"):
+        return _decode_strings(header, sections, is_binary=(kind == "Binary"))
+    if kind in ("List", "Array"):
+        child = decode_chunk(sections[2]).to_arrow()
+        offsets = pa.Array.from_buffers(pa.int64(), length + 1, [None, pa.py_buffer(sections[1])])
+        mask = pa.Array.from_buffers(pa.bool_(), length, [None, pa.py_buffer(sections[0])]) if sections[0] else None
+        if mask is not None:
+            mask = pc.invert(mask)
+        return pa.LargeListArray.from_arrays(offsets, child, mask=mask)
+    if kind == "Struct":
+        children = [decode_chunk(section).to_arrow() for section in sections[1:]]
+        names = [f["name"] for f in descriptor["fields"]]
+        mask = None
+        if sections[0]:
+            mask = pc.invert(pa.Array.from_buffers(pa.bool_(), length, [None, pa.py_buffer(sections[0])]))
+        return pa.StructArray.from_arrays(children, names=names, mask=mask)
+    raise TypeError(f"Unknown dtype descriptor: {descriptor}")
+
+def decode_chunk(content: bytes) -> pl.Series:
+    """The inverse of `encode_series`."""
+    header, sections = read_header(content)
+    arr = _decode_to_arrow(header, sections)
+    series = pl.from_arrow(arr)
+    if not isinstance(series, pl.Series):
+        series = series.to_series()
+
+    dtype = dtype_from_descriptor(header["dtype"])
+    if series.dtype != dtype:
+        series = series.cast(dtype)
+    return series.alias(header["name"])
@@ -1,16 +1,16 @@
 import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
 import struct
 
 # --- New Project Dependencies ---
 # These must be installed: pip install polars pyarrow.
 import polars as pl
-import pyarrow as pa
 
 # Import metadata helpers to access the new schema cache functions
-from datagit.storage import metadata, repository
+from datagit.storage import cache, codec, delta, materialize, metadata, objects, repository, stats
 from rich.console import Console
 
 console = Console()
@@ -20,52 +20,17 @@ CHUNK_ROW_SIZE = 10_000
 
 # --- CORE STORAGE FUNCTIONS ---
 
-def hash_content(content: bytes) -> str:
-    """Computes the SHA-256 hash of byte content for recipes and manifests."""
-    return hashlib.sha256(content).hexdigest()
-
-def save_object(repo_path: Path, content: bytes, obj_type_dir: str) -> str:
-    """Hashes and saves non-chunk objects like recipes and manifests."""
-    content_hash = hash_content(content)
-    obj_dir = repo_path / obj_type_dir
-    obj_path = obj_dir / content_hash
-
-    if not obj_path.exists():
-        console.log(f"[yellow]  -> Saving new {obj_type_dir.rstrip('s')} object:[/yellow] [cyan]{content_hash[:12]}[/cyan]")
-        obj_path.write_bytes(content)
-    return content_hash
-
 # --- CANONICAL DATA SERIALIZATION & HASHING ---
 
 def get_canonical_bytes_and_hash(series: pl.Series) -> Tuple[bytes, str]:
     """
-    This is the definitive engine for both hashing and storage. It first converts
-    the complex Series object to a simple list of Python primitives, then creates a
-    stable, canonical binary representation. This guarantees perfect determinism.
+    This is the definitive engine for both hashing and storage. The Series is
+    encoded with the typed chunk codec, which stores every dtype in a compact
+    native layout (bit-packed booleans, fixed-width numbers and temporals,
+    dictionary-encoded strings) and depends only on the Series' name, dtype and
+    values. This guarantees perfect determinism.
     """
-    hasher = hashlib.sha256()
-    byte_parts = []
-    
-    name_bytes = series.name.encode('utf-8')
-    dtype_bytes = str(series.dtype).encode('utf-8')
-    byte_parts.extend([name_bytes, dtype_bytes])
-
-    values_as_primitives = series.to_list()
-
-    for value in values_as_primitives:
-        if value is None:
-            part = b'\x00\x00NULL\x00\x00'
-        elif isinstance(value, str):
-            part = value.encode('utf-8')
-        elif isinstance(value, int):
-            part = value.to_bytes(8, byteorder='big', signed=True)
-        elif isinstance(value, float):
-            part = struct.pack('>d', value)
-        else:
-            part = str(value).encode('utf-8')
-        byte_parts.append(part)
-
-    full_byte_stream = b'\x01'.join(byte_parts)
+    full_byte_stream = codec.encode_series(series)
     content_hash = hashlib.sha256(full_byte_stream).hexdigest()
 
     return full_byte_stream, content_hash
@@ -75,13 +40,204 @@ def save_chunk_if_needed(repo_path: Path, chunk_hash: str, chunk_content: bytes)
     Saves the chunk content to storage, using the pre-computed deterministic hash
     as the filename.
     """
-    obj_path = repo_path / "chunks" / chunk_hash
-    if not obj_path.exists():
+    if objects.get_object_store(repo_path).put("chunk", chunk_hash, chunk_content):
         console.log(f"[yellow]  -> Saving new chunk object:[/yellow] [cyan]{chunk_hash[:12]}[/cyan]")
-        obj_path.write_bytes(chunk_content)
 
 # --- MERKLE TREE CONSTRUCTION (for `add`) ---
 
+def column_recipe_content(
+    chunk_hashes: List[str],
+    chunk_stats: Optional[List[Dict[str, Any]]],
+    dtype_descriptor: Any,
+) -> bytes:
+    """
+    Serializes a column recipe: the ordered chunk hashes, their zone maps and
+    the column's dtype. `chunk_stats` may be None when the zone maps are unknown.
+    """
+    column_recipe_data: Dict[str, Any] = {"chunks": chunk_hashes, "dtype": dtype_descriptor}
+    if chunk_stats is not None:
+        column_recipe_data["stats"] = chunk_stats
+    return json.dumps(column_recipe_data, sort_keys=True).encode()
+
+def save_column_recipe(
+    repo_path: Path,
+    chunk_hashes: List[str],
+    chunk_stats: Optional[List[Dict[str, Any]]],
+    dtype_descriptor: Any,
+) -> str:
+    """Saves a column recipe (see `column_recipe_content`)."""
+    return repository.save_object(repo_path, column_recipe_content(chunk_hashes, chunk_stats, dtype_descriptor), "recipes")
+
+def file_recipe_content(column_order: List[str], column_recipes: List[Dict[str, Any]]) -> bytes:
+    """
+    Serializes a columnar file recipe. `column_recipes` holds one {"name",
+    "recipe", "dtype"} entry per column; the dtype lets readers resolve the
+    schema without opening every column recipe.
+    """
+    # The list of columns for the recipe is sorted to ensure a stable hash.
+    sorted_column_recipes = sorted(column_recipes, key=lambda x: x['name'])
+
+    file_recipe_data = {
+        "type": "columnar",
+        # --- FIX: Add the original, unsorted order to the recipe ---
+        "column_order": column_order,
+        "columns": sorted_column_recipes
+    }
+    return json.dumps(file_recipe_data, sort_keys=True).encode()
+
+def save_file_recipe(repo_path: Path, column_order: List[str], column_recipes: List[Dict[str, Any]]) -> str:
+    """Saves a columnar file recipe (see `file_recipe_content`)."""
+    return repository.save_object(repo_path, file_recipe_content(column_order, column_recipes), "recipes")
+
+def _parent_column_chunks(repo_path: Path, relative_file_path: str) -> Dict[str, List[str]]:
+    """Returns the chunk hashes of every column of a file in the most recent commit that contains it."""
+    for commit_hash, _ in repository.iter_history(repo_path, repository.get_head_commit(repo_path)):
+        file_recipe_hash = repository.get_commit_file(repo_path, commit_hash, relative_file_path)
+        if not file_recipe_hash:
+            continue
+        file_recipe = repository.get_recipe(repo_path, file_recipe_hash) or {}
+        return {
+            col_info["name"]: (repository.get_recipe(repo_path, col_info["recipe"]) or {}).get("chunks", [])
+            for col_info in file_recipe.get("columns", [])
+        }
+    return {}
+
+def _encode_as_delta(repo_path: Path, base_hash: str, series: pl.Series, chunk_content: bytes, max_depth: int) -> Optional[bytes]:
+    """Encodes a chunk as a delta against `base_hash` if that is allowed and pays off."""
+    base_content = repository.get_object(repo_path, base_hash, "chunk")
+    if base_content is None or delta.chunk_depth(base_content) >= max_depth:
+        return None
+    base_series = load_chunk(repo_path, base_hash)
+    if base_series is None:
+        return None
+    delta_content = delta.encode_delta(base_series, base_hash, delta.chunk_depth(base_content), series)
+    if delta_content is None or len(delta_content) > len(chunk_content) * delta.DELTA_MAX_SIZE_RATIO:
+        return None
+    return delta_content
+
+# --- APPEND-ONLY INGEST ---
+# Most tracked files only ever grow at the end. Every ingest records, keyed by
+# the resulting file recipe hash, the byte length and SHA-256 of the source
+# and the byte offset where the rows of its last chunk begin (or where the
+# next chunk would begin, if the file ends on a chunk boundary). When a file
+# later starts with exactly those bytes, every chunk before that offset is
+# unchanged: its hash and zone map are taken from the previous recipe and only
+# the tail (the old last chunk plus the appended rows) is parsed and chunked.
+# The recipe is the one a full ingest would produce.
+#
+# Offsets are found by counting lines, which is only valid if no quoted field
+# contains a newline; a file whose line count differs from its row count is
+# always ingested in full. Sources are streamed, never loaded whole.
+
+INGEST_SOURCES_CACHE_NAME = "ingest-sources-v1"
+
+# Bytes read at a time when hashing or scanning a source file.
+SCAN_BLOCK_SIZE = 1 << 20
+
+def _line_count(content: bytes, start: int) -> int:
+    """Counts the lines from `start` to the end, including a last line without a newline."""
+    if start >= len(content):
+        return 0
+    return content.count(b"\n", start) + (0 if content.endswith(b"\n") else 1)
+
+def _line_offset(content: bytes, start: int, lines: int) -> int:
+    """Returns the offset of the line `lines` lines after the one starting at `start`."""
+    position = start
+    for _ in range(lines):
+        newline = content.find(b"\n", position)
+        if newline < 0:
+            return len(content)
+        position = newline + 1
+    return position
+
+def _tail_line(reused_chunks: int, rows: int, last_line_complete: bool) -> Tuple[int, int]:
+    """
+    Picks where the next append's tail starts: returns (chunks before it, its
+    line number counted from the current tail). A chunk boundary at the very
+    end only counts if the last line is complete; otherwise appended bytes
+    could still extend the last row.
+    """
+    total = reused_chunks * CHUNK_ROW_SIZE + rows
+    if total % CHUNK_ROW_SIZE == 0 and last_line_complete:
+        next_reused = total // CHUNK_ROW_SIZE
+    else:
+        next_reused = max(0, (total - 1) // CHUNK_ROW_SIZE)
+    return next_reused, (next_reused - reused_chunks) * CHUNK_ROW_SIZE
+
+def _scan_source(file_path: Path, line_start: int, target_lines: Sequence[int]) -> Dict[str, Any]:
+    """
+    Streams a source file once: its SHA-256 and size, the number of lines from
+    `line_start` on, whether the last of them is complete, and the offsets of
+    the given line numbers (counted from `line_start`).
+    """
+    digest = hashlib.sha256()
+    offsets = {line: line_start for line in target_lines if line == 0}
+    pending = sorted(line for line in set(target_lines) if line > 0)
+    newlines, position, last_byte = 0, 0, b""
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+            skip = max(0, line_start - position)
+            block_newlines = block.count(b"\n", skip)
+            while pending and pending[0] <= newlines + block_newlines:
+                # The target line starts right after the newline that ends the line before it.
+                line = pending.pop(0)
+                offsets[line] = position + _line_offset(block, skip, line - newlines)
+            newlines += block_newlines
+            position += len(block)
+            last_byte = block[-1:]
+    complete = position <= line_start or last_byte == b"\n"
+    return {
+        "sha256": digest.hexdigest(),
+        "size": position,
+        "lines": newlines + (0 if complete else 1),
+        "complete": complete,
+        "offsets": offsets,
+    }
+
+def _previous_ingest(
+    repo_path: Path, relative_file_path: str, file_path: Path, schema: Dict[str, Any], sources: cache.KeyValueCache
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], bytes, bytes, Any]]:
+    """
+    Finds the staged or committed version of a file that the file now appends
+    to. Returns its ingest source and column recipes, the header line, the
+    tail from the source's tail offset on and the SHA-256 of the whole file;
+    or None.
+    """
+    file_recipe_hash = metadata.load_index(repo_path).get(relative_file_path) or repository.get_file_hash_from_last_commit(repo_path, relative_file_path)
+    source = sources.get(file_recipe_hash) if file_recipe_hash else None
+    if source is None or source["schema"] != schema or file_path.stat().st_size < source["size"]:
+        return None
+
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        f.seek(0)
+        digest = hashlib.sha256()
+        remaining = source["size"]
+        while remaining:
+            block = f.read(min(SCAN_BLOCK_SIZE, remaining))
+            if not block:
+                return None
+            digest.update(block)
+            remaining -= len(block)
+        if digest.hexdigest() != source["sha256"]:
+            return None
+        f.seek(source["tail_offset"])
+        tail = f.read()
+    # The digest continues over the appended bytes, so the file is read only once.
+    digest.update(tail[source["size"] - source["tail_offset"]:])
+
+    file_recipe = repository.get_recipe(repo_path, file_recipe_hash)
+    if not file_recipe:
+        return None
+    column_recipes = {col_info["name"]: repository.get_recipe(repo_path, col_info["recipe"]) for col_info in file_recipe["columns"]}
+    if any(r is None or "stats" not in r for r in column_recipes.values()):
+        return None
+    return source, column_recipes, header, tail, digest
+
 def construct_merkle_tree_for_file(repo_path: Path, file_path: Path, relative_file_path: str) -> str:
     """The main engine for Phase 1, re-architected for perfect determinism."""
     console.rule(f"[bold blue]Constructing Merkle Tree for '{relative_file_path}'")
@@ -89,19 +245,72 @@ def construct_merkle_tree_for_file(repo_path: Path, file_path: Path, relative_fi
     schemas = metadata.load_schemas(repo_path)
     cached_schema_info = schemas.get(relative_file_path)
 
-    try:
-        if cached_schema_info:
-            polars_dtypes = {k: getattr(pl, v) for k, v in cached_schema_info.items()}
-            df = pl.read_csv(file_path, dtypes=polars_dtypes, ignore_errors=True)
+    with cache.KeyValueCache(repo_path, INGEST_SOURCES_CACHE_NAME) as sources:
+        try:
+            previous = _previous_ingest(repo_path, relative_file_path, file_path, cached_schema_info, sources) if cached_schema_info else None
+            if cached_schema_info:
+                polars_dtypes = {k: codec.parse_dtype(v) for k, v in cached_schema_info.items()}
+                df = None
+                if previous:
+                    source, previous_columns, header, tail, digest = previous
+                    # Only the tail is parsed, behind a copy of the header line.
+                    df = pl.read_csv(header + tail, schema_overrides=polars_dtypes, ignore_errors=True)
+                    if _line_count(tail, 0) != df.height or set(previous_columns) != set(df.columns):
+                        # Lines and rows disagree (e.g. a newline inside a quoted field).
+                        df, previous = None, None
+                if df is None:
+                    df = pl.read_csv(file_path, schema_overrides=polars_dtypes, ignore_errors=True)
+            else:
+                df = pl.read_csv(file_path, ignore_errors=True)
+                polars_schema_to_cache = {name: codec.dtype_to_descriptor(dtype) for name, dtype in df.schema.items()}
+                schemas[relative_file_path] = polars_schema_to_cache
+                metadata.save_schemas(repo_path, schemas)
+
+        except Exception as e:
+            raise IOError(f"Could not read or parse file: {file_path}. Error: {e}")
+
+        if previous:
+            reused_chunks, tail_offset = source["reused_chunks"], source["tail_offset"]
+            console.log(f"[bold]Appended rows:[/bold] reusing {reused_chunks} chunk(s) per column, parsing {df.height} row(s)")
+            complete = not tail or tail.endswith(b"\n")
+            next_reused, next_line = _tail_line(reused_chunks, df.height, complete)
+            scan = {
+                "sha256": digest.hexdigest(),
+                "size": tail_offset + len(tail),
+                "lines": _line_count(tail, 0),
+                "complete": complete,
+                "offsets": {next_line: tail_offset + _line_offset(tail, 0, next_line)},
+            }
         else:
-            df = pl.read_csv(file_path, ignore_errors=True)
-            polars_schema_to_cache = {name: str(dtype) for name, dtype in df.schema.items()}
-            schemas[relative_file_path] = polars_schema_to_cache
-            metadata.save_schemas(repo_path, schemas)
+            previous_columns, reused_chunks = {}, 0
+            with open(file_path, "rb") as f:
+                tail_offset = len(f.readline())
+            candidates = [_tail_line(0, df.height, complete)[1] for complete in (True, False)]
+            scan = _scan_source(file_path, tail_offset, candidates)
+            next_reused, next_line = _tail_line(0, df.height, scan["complete"])
 
-    except Exception as e:
-        raise IOError(f"Could not read or parse file: {file_path}. Error: {e}")
+        file_recipe_hash = _build_file_recipe(repo_path, relative_file_path, df, previous_columns, reused_chunks)
 
+        if scan["lines"] == df.height:
+            sources.put(file_recipe_hash, {
+                "size": scan["size"],
+                "sha256": scan["sha256"],
+                "tail_offset": scan["offsets"][next_line],
+                "reused_chunks": next_reused,
+                "schema": schemas[relative_file_path],
+            })
+
+    console.rule(f"[bold green]Final File Recipe Hash: {file_recipe_hash}")
+    return file_recipe_hash
+
+def _build_file_recipe(
+    repo_path: Path, relative_file_path: str, df: pl.DataFrame, previous_columns: Dict[str, Dict[str, Any]], reused_chunks: int
+) -> str:
+    """
+    Chunks, stores and records every column of `df`. The first `reused_chunks`
+    chunks of each column are taken from `previous_columns`, and `df` holds the
+    rows after them.
+    """
     # --- FIX: Store the original column order ---
     # We capture the exact column order from the DataFrame as it was read.
     original_column_order = df.columns
@@ -112,48 +321,64 @@ def construct_merkle_tree_for_file(repo_path: Path, file_path: Path, relative_fi
     # We still sort the columns before processing. This is critical to ensure
     # the final file recipe hash is deterministic. The sort order here is
     # ONLY for calculating the hash, not for storing the structure.
-    for column_name in sorted(df.columns):
-        column_chunk_hashes: List[str] = []
-        for i in range(0, df.height, CHUNK_ROW_SIZE):
-            chunk_series = df.select(column_name).slice(i, CHUNK_ROW_SIZE).to_series()
-            chunk_content_for_storage, chunk_hash = get_canonical_bytes_and_hash(chunk_series)
-            save_chunk_if_needed(repo_path, chunk_hash, chunk_content_for_storage)
-            column_chunk_hashes.append(chunk_hash)
-
-        column_recipe_data = {"chunks": column_chunk_hashes}
-        column_recipe_content = json.dumps(column_recipe_data, sort_keys=True).encode()
-        col_recipe_hash = save_object(repo_path, column_recipe_content, "recipes")
-        
-        column_recipes.append({"name": column_name, "recipe": col_recipe_hash})
-
-    # The list of columns for the recipe is also sorted to ensure a stable hash.
-    sorted_column_recipes = sorted(column_recipes, key=lambda x: x['name'])
-    
-    file_recipe_data = {
-        "type": "columnar",
-        # --- FIX: Add the original, unsorted order to the recipe ---
-        "column_order": original_column_order,
-        "columns": sorted_column_recipes
-    }
-    file_recipe_content = json.dumps(file_recipe_data, sort_keys=True).encode()
-    file_recipe_hash = save_object(repo_path, file_recipe_content, "recipes")
-    
-    console.rule(f"[bold green]Final File Recipe Hash: {file_recipe_hash}")
-    return file_recipe_hash
+    delta_settings = metadata.load_config(repo_path)["delta_chunks"]
+    parent_chunks = _parent_column_chunks(repo_path, relative_file_path) if delta_settings["enabled"] else {}
+
+    store = objects.get_object_store(repo_path)
+    with store.batch():
+        for column_name in sorted(df.columns):
+            base_hashes = parent_chunks.get(column_name, [])
+            chunks: Dict[str, Tuple[int, pl.Series, bytes]] = {}
+            previous_recipe = previous_columns.get(column_name, {"chunks": [], "stats": []})
+            column_chunk_hashes: List[str] = previous_recipe["chunks"][:reused_chunks]
+            column_chunk_stats: List[Dict[str, Any]] = previous_recipe["stats"][:reused_chunks]
+            for i in range(0, df.height, CHUNK_ROW_SIZE):
+                chunk_series = df.select(column_name).slice(i, CHUNK_ROW_SIZE).to_series()
+                chunk_content_for_storage, chunk_hash = get_canonical_bytes_and_hash(chunk_series)
+                chunks.setdefault(chunk_hash, (reused_chunks + i // CHUNK_ROW_SIZE, chunk_series, chunk_content_for_storage))
+                column_chunk_hashes.append(chunk_hash)
+                # Zone maps are a by-product of chunking; read paths use them to skip chunks.
+                column_chunk_stats.append(stats.compute_chunk_stats(chunk_series))
+
+            # One existence lookup per column instead of one per chunk.
+            existing = store.has_many("chunk", chunks)
+            for chunk_hash, (chunk_index, chunk_series, chunk_content) in chunks.items():
+                if chunk_hash in existing:
+                    continue
+                if chunk_index < len(base_hashes):
+                    # Sparse edits are stored as a delta against the same chunk in the parent commit.
+                    delta_content = _encode_as_delta(
+                        repo_path, base_hashes[chunk_index], chunk_series, chunk_content, delta_settings["max_depth"]
+                    )
+                    chunk_content = delta_content or chunk_content
+                save_chunk_if_needed(repo_path, chunk_hash, chunk_content)
+
+            dtype_descriptor = codec.dtype_to_descriptor(df.schema[column_name])
+            col_recipe_hash = save_column_recipe(repo_path, column_chunk_hashes, column_chunk_stats, dtype_descriptor)
+            column_recipes.append({"name": column_name, "recipe": col_recipe_hash, "dtype": dtype_descriptor})
+
+        return save_file_recipe(repo_path, original_column_order, column_recipes)
 
 # --- DATA RECONSTRUCTION (for `checkout` / `activate`) ---
 
 def deserialize_chunk_from_storage(chunk_content: bytes) -> pl.Series:
     """
-    The inverse of `get_canonical_bytes_and_hash`. It reads our custom binary
-    format from a chunk file and reconstructs it into a Polars Series.
+    The inverse of `get_canonical_bytes_and_hash`. It reads a chunk file and
+    reconstructs it into a Polars Series. Chunks written before the typed codec
+    existed are still understood.
     """
+    if codec.is_typed_chunk(chunk_content):
+        return codec.decode_chunk(chunk_content)
+    return _deserialize_legacy_chunk(chunk_content)
+
+def _deserialize_legacy_chunk(chunk_content: bytes) -> pl.Series:
+    """Reads the original text-based chunk format: name, dtype and values separated by 0x01."""
     byte_parts = chunk_content.split(b'\x01')
     col_name = byte_parts[0].decode('utf-8')
     dtype_str = byte_parts[1].decode('utf-8')
     raw_values = byte_parts[2:]
 
-    polars_dtype = getattr(pl, dtype_str)
+    polars_dtype = codec.parse_dtype(dtype_str)
     values = []
     for val_bytes in raw_values:
         if val_bytes == b'\x00\x00NULL\x00\x00':
@@ -169,53 +394,165 @@ def deserialize_chunk_from_storage(chunk_content: bytes) -> pl.Series:
             
     return pl.Series(name=col_name, values=values, dtype=polars_dtype)
 
-def reconstruct_file_from_recipe(repo_path: Path, repo_root: Path, file_path_str: str, file_recipe: Dict[str, Any]):
-    """Rebuilds a single file from its versioned chunks."""
-    all_columns_data = []
-    
+def load_chunk(repo_path: Path, chunk_hash: str) -> Optional[pl.Series]:
+    """
+    Reads and decodes a single chunk, or returns None if it is missing. Delta
+    chunks are resolved by walking down to their full base chunk and applying
+    the deltas on the way back up.
+    """
+    chunk_content = repository.get_object(repo_path, chunk_hash, "chunk")
+    if chunk_content is None:
+        return None
+
+    deltas = []
+    while delta.is_delta_chunk(chunk_content):
+        header, positions, values = delta.read_delta(chunk_content)
+        deltas.append((header, positions, values))
+        chunk_content = repository.get_object(repo_path, header["base"], "chunk")
+        if chunk_content is None:
+            raise IOError(f"Missing base chunk '{header['base']}' of delta chunk '{chunk_hash}'.")
+
+    series = deserialize_chunk_from_storage(chunk_content)
+    for header, positions, values in reversed(deltas):
+        series = delta.apply_delta(series, header, positions, values)
+    return series
+
+def get_file_schema(repo_path: Path, file_recipe: Dict[str, Any]) -> Dict[str, pl.DataType]:
+    """
+    Returns the file's schema in its original column order, read from the dtypes
+    recorded in the recipes. Older recipes without dtypes fall back to decoding
+    the first chunk of the column.
+    """
+    schema = {}
     for col_info in file_recipe["columns"]:
-        col_recipe_hash = col_info["recipe"]
-        col_recipe = repository.get_recipe(repo_path, col_recipe_hash)
-        
-        column_chunks = []
-        for chunk_hash in col_recipe["chunks"]:
-            chunk_content = repository.get_object(repo_path, chunk_hash, "chunk")
-            if chunk_content:
-                chunk_series = deserialize_chunk_from_storage(chunk_content)
-                column_chunks.append(chunk_series)
-        
-        if column_chunks:
-            full_column = pl.concat(column_chunks)
-            all_columns_data.append(full_column)
-
-    if all_columns_data:
-        df = pl.DataFrame(all_columns_data)
-        
-        # --- FIX: Use the stored column order to reconstruct the file correctly ---
-        # We retrieve the original column order from the recipe.
-        original_order = file_recipe.get("column_order")
-        if original_order:
-            # Reorder the DataFrame columns to match the original file.
-            df = df.select(original_order)
-        
-        output_path = repo_root / file_path_str
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.write_csv(output_path)
-        console.log(f"  -> Reconstructed file [green]'{file_path_str}'[/green]")
+        if "dtype" in col_info:
+            schema[col_info["name"]] = codec.dtype_from_descriptor(col_info["dtype"])
+            continue
+
+        col_recipe = repository.get_recipe(repo_path, col_info["recipe"]) or {}
+        if "dtype" in col_recipe:
+            schema[col_info["name"]] = codec.dtype_from_descriptor(col_recipe["dtype"])
+        elif col_recipe.get("chunks"):
+            first_chunk = load_chunk(repo_path, col_recipe["chunks"][0])
+            schema[col_info["name"]] = first_chunk.dtype if first_chunk is not None else pl.String
+        else:
+            schema[col_info["name"]] = pl.String
+
+    order = file_recipe.get("column_order") or sorted(schema)
+    return {name: schema[name] for name in order}
+
+def iter_file_batches(
+    repo_path: Path,
+    file_recipe: Dict[str, Any],
+    columns: Optional[Sequence[str]] = None,
+    filters: Sequence[stats.Filter] = (),
+) -> Iterator[pl.DataFrame]:
+    """
+    Yields a file's rows one chunk index (row group) at a time. Only the column
+    recipes in `columns` (plus those referenced by `filters`) are read, and chunk
+    indices whose zone maps rule out the filters are never decoded.
+    """
+    col_recipe_hashes = {c["name"]: c["recipe"] for c in file_recipe["columns"]}
+    order = file_recipe.get("column_order") or sorted(col_recipe_hashes)
+    selected = [c for c in order if columns is None or c in columns]
+    needed = selected + [c for c, _, _ in filters if c not in selected and c in col_recipe_hashes]
+
+    col_recipes = {name: repository.get_recipe(repo_path, col_recipe_hashes[name]) or {} for name in needed}
+    chunk_count = max((len(r.get("chunks", [])) for r in col_recipes.values()), default=0)
+
+    expr = None
+    for chunk_index in stats.select_chunks(col_recipes, filters, chunk_count):
+        batch = []
+        for name in needed:
+            chunk_hash = col_recipes[name]["chunks"][chunk_index]
+            chunk_series = load_chunk(repo_path, chunk_hash)
+            if chunk_series is None:
+                raise IOError(f"Missing chunk '{chunk_hash}' for column '{name}'.")
+            batch.append(chunk_series.alias(name))
+        df = pl.DataFrame(batch)
+
+        if filters:
+            if expr is None:
+                expr = stats.filter_expression(filters, df.schema)
+            df = df.filter(expr)
+        yield df.select(selected)
+
+def read_file_from_recipe(
+    repo_path: Path,
+    file_recipe: Dict[str, Any],
+    columns: Optional[Sequence[str]] = None,
+    filters: Sequence[stats.Filter] = (),
+) -> pl.DataFrame:
+    """Reads a file (or the requested columns and matching rows of it) into memory."""
+    batches = list(iter_file_batches(repo_path, file_recipe, columns, filters))
+    if batches:
+        return pl.concat(batches)
+    schema = get_file_schema(repo_path, file_recipe)
+    return pl.DataFrame(schema={name: dtype for name, dtype in schema.items() if columns is None or name in columns})
+
+def reconstruct_file_from_recipe(repo_path: Path, repo_root: Path, file_path_str: str, file_recipe: Dict[str, Any]):
+    """
+    Rebuilds a single file from its versioned chunks. Rows are streamed one
+    chunk index (row group) at a time and appended to the output, so memory
+    stays bounded by a single row group across all columns no matter how
+    large the file is.
+    """
+    output_path = repo_root / file_path_str
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target and swap it in at the end, so a failed restore
+    # never leaves a truncated file behind (or writes through a hardlink).
+    temp_path = output_path.with_name(f".{output_path.name}.datagit-tmp")
+
+    try:
+        with open(temp_path, "wb") as f:
+            wrote_header = False
+            for batch in iter_file_batches(repo_path, file_recipe):
+                batch.write_csv(f, include_header=not wrote_header)
+                wrote_header = True
+            if not wrote_header:
+                # A file without rows still has its header line.
+                pl.DataFrame(schema=get_file_schema(repo_path, file_recipe)).write_csv(f)
+        os.replace(temp_path, output_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    console.log(f"  -> Reconstructed file [green]'{file_path_str}'[/green]")
 
 def reconstruct_working_directory(repo_path: Path, dir_recipe: Dict[str, Any]):
     """
     The main reconstruction engine. It iterates through a directory recipe and
     rebuilds all the files it describes, overwriting the user's working directory.
+    When the materialization cache is enabled, files it already holds are placed
+    directly and never decoded.
     """
     repo_root = repo_path.parent
-    files_to_reconstruct = dir_recipe.get("files", {})
+    files_to_reconstruct = repository.get_tree_files(repo_path, dir_recipe)
 
     console.log("[bold]Reconstructing files from commit...[/bold]")
     for file_path_str, file_recipe_hash in files_to_reconstruct.items():
+        output_path = repo_root / file_path_str
+        if materialize.restore(repo_path, file_recipe_hash, output_path):
+            console.log(f"  -> Restored file [green]'{file_path_str}'[/green] from the materialization cache")
+            continue
+
         file_recipe = repository.get_recipe(repo_path, file_recipe_hash)
         if file_recipe:
             reconstruct_file_from_recipe(repo_path, repo_root, file_path_str, file_recipe)
+            materialize.store(repo_path, file_recipe_hash, output_path)
         else:
             console.log(f"[red]Warning: Could not find recipe '{file_recipe_hash}' for file '{file_path_str}'. Skipping.[/red]")
 
+def remove_working_files(repo_path: Path, relative_paths: Iterable[str]):
+    """
+    Deletes files a new tree no longer tracks from the working directory, along
+    with directories they leave empty.
+    """
+    repo_root = repo_path.parent
+    for file_path_str in relative_paths:
+        output_path = repo_root / file_path_str
+        output_path.unlink(missing_ok=True)
+        console.log(f"  -> Removed file [yellow]'{file_path_str}'[/yellow]")
+        directory = output_path.parent
+        while directory != repo_root and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
@@ -0,0 +1,348 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import signal
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from datagit.storage import objects, repository, worktree
+
+# --- DAEMON ---
+# An opt-in background process per repository. It keeps the object store
+# (with every recipe and manifest read so far), the list of working files and
+# the recipe hash of every tracked file warm in memory, and answers `status`,
+# `add` and `log` over a Unix socket in `.datagit/`.
+#
+# Working-tree changes are tracked with inotify where available, so a file is
+# only re-hashed after it was actually written. Elsewhere a polling thread
+# compares file sizes and modification times.
+#
+# The protocol is one JSON request line and one JSON response line per
+# connection: {"command": ..., "args": {...}} -> {"ok": true, "result": ...}.
+# Commands run one at a time. The CLI falls back to doing the work itself
+# whenever no daemon answers.
+
+SOCKET_NAME = "daemon.sock"
+INFO_NAME = "daemon.json"
+LOG_NAME = "daemon.log"
+
+# Unix socket paths are limited to about 100 bytes; longer ones move to the temp directory.
+MAX_SOCKET_PATH_LENGTH = 100
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# How long the CLI waits for a daemon to accept a connection, and then for its
+# answer, before doing the work itself. A busy or hung daemon never blocks it.
+CONNECT_TIMEOUT = 1.0
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+def socket_path(repo_path: Path) -> Path:
+    path = repo_path.resolve() / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH_LENGTH:
+        return path
+    digest = hashlib.sha256(str(repo_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"datagit-{digest}.sock"
+
+# --- CLIENT ---
+
+def request(repo_path: Path, command: str, timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT, **args: Any) -> Optional[Any]:
+    """
+    Sends a request to the repository's daemon. Returns None if no daemon
+    answers within `timeout` seconds; raises RuntimeError if the daemon
+    reports an error.
+    """
+    path = socket_path(repo_path)
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps({"command": command, "args": args}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        # No daemon behind the socket (one that died left it behind), or one
+        # that doesn't answer in time.
+        return None
+    if not line:
+        return None
+
+    response = json.loads(line)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+def read_info(repo_path: Path) -> Optional[Dict[str, Any]]:
+    """Returns what the running daemon recorded about itself, if any."""
+    info_path = repo_path / INFO_NAME
+    if info_path.exists():
+        return json.loads(info_path.read_text())
+    return None
+
+# --- WORKING TREE STATE ---
+
+class WorkingTreeState:
+    """
+    The working files and the recipe hashes of tracked files, kept up to date
+    by a watcher. Every change to a path bumps its generation, so a hash
+    computed while the file was being written is never cached.
+    """
+
+    def __init__(self, repo_path: Path, validate_with_stat: bool):
+        self.repo_path = repo_path
+        self.repo_root = repo_path.parent
+        # Without inotify, events arrive late (or not at all between polls),
+        # so cached hashes are also checked against the file's size and mtime.
+        self.validate_with_stat = validate_with_stat
+        self.lock = threading.Lock()
+        self.files: Set[str] = set()
+        self.hashes: Dict[str, Tuple[int, int, str]] = {}
+        self.generations: Dict[str, int] = {}
+        self.rescan()
+
+    def rescan(self) -> None:
+        files = worktree.list_working_files(self.repo_root)
+        with self.lock:
+            for path in self.files ^ files:
+                self._forget(path)
+            self.files = files
+
+    def _forget(self, relative_path: str) -> None:
+        self.generations[relative_path] = self.generations.get(relative_path, 0) + 1
+        self.hashes.pop(relative_path, None)
+
+    def file_changed(self, relative_path: str) -> None:
+        if worktree.is_ignored(relative_path):
+            return
+        exists = (self.repo_root / relative_path).is_file()
+        with self.lock:
+            self._forget(relative_path)
+            if exists:
+                self.files.add(relative_path)
+            else:
+                self.files.discard(relative_path)
+
+    def snapshot(self) -> Set[str]:
+        with self.lock:
+            return set(self.files)
+
+    def _stat(self, relative_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = (self.repo_root / relative_path).stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get_hash(self, relative_path: str) -> str:
+        """Returns the file recipe hash of a working file, hashing it only if it changed."""
+        stat = self._stat(relative_path) if self.validate_with_stat else None
+        with self.lock:
+            entry = self.hashes.get(relative_path)
+            generation = self.generations.get(relative_path, 0)
+        if entry is not None and (not self.validate_with_stat or entry[:2] == stat):
+            return entry[2]
+
+        stat = self._stat(relative_path)
+        file_hash = worktree.hash_working_file(self.repo_path, relative_path)
+        with self.lock:
+            if stat is not None and self.generations.get(relative_path, 0) == generation:
+                self.hashes[relative_path] = (*stat, file_hash)
+        return file_hash
+
+# --- WATCHERS ---
+
+# inotify(7) event masks.
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+class InotifyWatcher(threading.Thread):
+    """Feeds inotify events for every directory of the working tree into the state."""
+
+    kind = "inotify"
+
+    def __init__(self, state: WorkingTreeState):
+        super().__init__(daemon=True)
+        self.state = state
+        self.stop_event = threading.Event()
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform.")
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        self.add_watches(state.repo_root)
+
+    def add_watches(self, directory: Path) -> None:
+        for root, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in worktree.IGNORE_DIRS]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd >= 0:
+                relative = os.path.relpath(root, self.state.repo_root)
+                self.watches[wd] = "" if relative == "." else relative
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([self.fd], [], [], 0.5)
+            if readable:
+                self.handle(os.read(self.fd, 64 * 1024))
+        os.close(self.fd)
+
+    def handle(self, data: bytes) -> None:
+        position, rescan = 0, False
+        while position < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, position)
+            position += EVENT_HEADER.size
+            name = os.fsdecode(data[position:position + name_len].rstrip(b"\0"))
+            position += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+
+            relative_path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # A directory appeared, vanished or moved: relist the tree.
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in worktree.IGNORE_DIRS:
+                    self.add_watches(self.state.repo_root / relative_path)
+                rescan = True
+            else:
+                self.state.file_changed(relative_path)
+        if rescan:
+            self.state.rescan()
+
+class PollingWatcher(threading.Thread):
+    """Detects working-tree changes by comparing file sizes and mtimes at an interval."""
+
+    kind = "polling"
+
+    def __init__(self, state: WorkingTreeState, interval: float = DEFAULT_POLL_INTERVAL):
+        super().__init__(daemon=True)
+        self.state = state
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.previous = self.scan()
+
+    def scan(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        return {path: self.state._stat(path) for path in worktree.list_working_files(self.state.repo_root)}
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            current = self.scan()
+            for path in set(current) | set(self.previous):
+                if current.get(path) != self.previous.get(path):
+                    self.state.file_changed(path)
+            self.previous = current
+
+# --- SERVER ---
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, repo_path: Path, state: WorkingTreeState, watcher: threading.Thread):
+        self.repo_path = repo_path
+        self.state = state
+        self.watcher = watcher
+        super().__init__(str(socket_path(repo_path)), DaemonRequestHandler)
+
+    def dispatch(self, command: str, args: Dict[str, Any]) -> Any:
+        if command == "ping":
+            return {"pid": os.getpid(), "watcher": self.watcher.kind, "files": len(self.state.files)}
+        if command == "status":
+            return worktree.compute_status(self.repo_path, self.state.snapshot(), self.state.get_hash)
+        if command == "add":
+            relative_path, file_hash, staged = worktree.stage_file(self.repo_path, Path(args["path"]), self.state.get_hash)
+            return {"path": relative_path, "hash": file_hash, "staged": staged}
+        if command == "log":
+            entries, missing = repository.read_log(self.repo_path, repository.get_head_commit(self.repo_path))
+            return {"view": repository.get_current_view_name(self.repo_path), "entries": entries, "missing": missing}
+        if command == "stop":
+            threading.Thread(target=self.shutdown).start()
+            return {"pid": os.getpid()}
+        raise RuntimeError(f"Unknown daemon command '{command}'.")
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+            response = {"ok": True, "result": self.server.dispatch(message["command"], message.get("args", {}))}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+def serve(repo_path: Path, use_inotify: bool = True, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+    """Runs the daemon in the foreground until it is stopped or receives SIGTERM/SIGINT."""
+    path = socket_path(repo_path)
+    if request(repo_path, "ping") is not None:
+        raise RuntimeError("A daemon is already running for this repository.")
+    path.unlink(missing_ok=True)
+
+    # Warm up: the data libraries and the objects read by later requests.
+    from datagit.storage import core  # noqa: F401
+    objects.cache_object_reads(repo_path)
+
+    watcher: Optional[threading.Thread] = None
+    if use_inotify:
+        state = WorkingTreeState(repo_path, validate_with_stat=False)
+        try:
+            watcher = InotifyWatcher(state)
+        except OSError:
+            watcher = None
+    if watcher is None:
+        state = WorkingTreeState(repo_path, validate_with_stat=True)
+        watcher = PollingWatcher(state, poll_interval)
+    watcher.start()
+
+    server = DaemonServer(repo_path, state, watcher)
+    info_path = repo_path / INFO_NAME
+    info_path.write_text(json.dumps({
+        "pid": os.getpid(), "socket": str(path), "watcher": watcher.kind, "started": time.time()
+    }, indent=2))
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        server.serve_forever()
+    finally:
+        watcher.stop_event.set()
+        server.server_close()
+        path.unlink(missing_ok=True)
+        info_path.unlink(missing_ok=True)
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional, Tuple
+
+import polars as pl
+
+from datagit.storage import codec
+from datagit.storage.delta_header import DELTA_MAGIC, chunk_depth, is_delta_chunk, pack_delta, read_delta_header
+
+# --- DELTA CHUNKS ---
+# A chunk that differs from an earlier version in only a few cells can be
+# stored as a delta against that version: the changed row positions plus their
+# new values. A delta chunk is laid out as:
+#
+#   DELTA_MAGIC | header length (uint32, little-endian) | JSON header | positions chunk | values chunk
+#
+# The header names the base chunk, the chain depth (a delta against a full
+# chunk has depth 1), the column name and row count of the result. Positions
+# and values are ordinary typed chunks. The framing lives in `delta_header`.
+#
+# A delta is stored under the hash of the *full* chunk it stands for, so
+# recipes, zone maps and every cache keyed by chunk hash are unaffected by how
+# the chunk is physically stored. Chains are capped at a maximum depth; the
+# next version after that is stored in full, which rebases the chain.
+
+# A delta is only kept when it is at most this fraction of the full chunk's size.
+DELTA_MAX_SIZE_RATIO = 0.5
+
+def read_delta(content: bytes) -> Tuple[Dict[str, Any], pl.Series, pl.Series]:
+    """Parses a delta chunk into its header, changed positions and new values."""
+    header, (positions, values) = read_delta_header(content)
+    return header, codec.decode_chunk(positions), codec.decode_chunk(values)
+
+def _align(base: pl.Series, length: int) -> pl.Series:
+    """Truncates or null-extends the base so rows appended to a chunk become changed positions."""
+    if base.len() >= length:
+        return base.slice(0, length)
+    return base.extend_constant(None, length - base.len())
+
+def apply_delta(base: pl.Series, header: Dict[str, Any], positions: pl.Series, values: pl.Series) -> pl.Series:
+    """Rebuilds a chunk from its base and a parsed delta."""
+    series = _align(base, header["length"])
+    if positions.len():
+        series = series.scatter(positions, values)
+    return series.alias(header["name"])
+
+def encode_delta(base: pl.Series, base_hash: str, base_depth: int, series: pl.Series) -> Optional[bytes]:
+    """
+    Encodes `series` as a delta against `base`. Returns None when a delta
+    can't represent the series exactly (e.g. the dtype changed).
+    """
+    if base.dtype != series.dtype:
+        return None
+    try:
+        aligned = _align(base, series.len())
+        changed = (~aligned.eq_missing(series)).arg_true().cast(pl.UInt32)
+        header = {"base": base_hash, "depth": base_depth + 1, "name": series.name, "length": series.len()}
+        positions, values = changed.alias("positions"), series.gather(changed)
+
+        # The hash of a delta chunk is that of the full chunk, so the delta must
+        # reproduce it exactly; dtypes whose cells can't be scattered don't qualify.
+        if not apply_delta(base, header, positions, values).equals(series, check_names=True, null_equal=True):
+            return None
+    except (pl.exceptions.PolarsError, TypeError, ValueError):
+        return None
+
+    return pack_delta(header, [codec.encode_series(positions), codec.encode_series(values)])
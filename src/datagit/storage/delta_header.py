@@ -0,0 +1,49 @@
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- DELTA CHUNK FRAMING ---
+# The outer layout of delta chunks (see `delta` for what they hold):
+#
+#   DELTA_MAGIC | header length (uint32, little-endian) | JSON header | sections...
+#
+# This module only knows the framing and needs no data libraries, so `fsck`
+# and `du` can tell delta chunks apart and follow their bases without loading
+# polars. `delta` builds and decodes the sections.
+
+DELTA_MAGIC = b"\x00DGD\x01"
+
+def is_delta_chunk(content: bytes) -> bool:
+    return content.startswith(DELTA_MAGIC)
+
+def pack_delta(header: Dict[str, Any], sections: List[bytes]) -> bytes:
+    """Frames a delta chunk; the header gains the byte size of every section."""
+    header = {**header, "sections": [len(s) for s in sections]}
+    header_bytes = json.dumps(header, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return b"".join([DELTA_MAGIC, struct.pack("<I", len(header_bytes)), header_bytes, *sections])
+
+def read_delta_header(content: bytes) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Parses the header of a delta chunk and splits its payload into sections."""
+    start = len(DELTA_MAGIC)
+    (header_len,) = struct.unpack_from("<I", content, start)
+    start += 4
+    header = json.loads(content[start:start + header_len])
+    position = start + header_len
+
+    sections = []
+    for size in header["sections"]:
+        sections.append(content[position:position + size])
+        position += size
+    return header, sections
+
+def chunk_depth(content: bytes) -> int:
+    """Returns the delta chain depth of a stored chunk; 0 for a full chunk."""
+    if not is_delta_chunk(content):
+        return 0
+    return read_delta_header(content)[0]["depth"]
+
+def delta_base(content: bytes) -> Optional[str]:
+    """Returns the base chunk of a delta chunk, or None for a full chunk."""
+    if not is_delta_chunk(content):
+        return None
+    return read_delta_header(content)[0]["base"]
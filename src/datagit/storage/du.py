@@ -0,0 +1,240 @@
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from datagit.storage import cache, delta_header, objects, repository
+
+# --- STORAGE ACCOUNTING ---
+# `du` walks every commit reachable from the given refs, down through the
+# directory trees, file recipes and column recipes to the chunks, and adds up
+# the stored size of the objects each commit, file and column refers to:
+#
+#   logical    - what the commit's files would take stored on their own: every
+#                file's chunks and recipes, with nothing shared (commits only).
+#   referenced - the distinct objects it refers to.
+#   unique     - referenced objects that nothing else at the same level (no
+#                other commit, file path or column) refers to; deleting it
+#                would free that much.
+#   shared     - referenced minus unique.
+#
+# Sizes are the bytes an object occupies in the store (a delta chunk counts its
+# delta, not the full chunk). A delta chunk can't be read without its base
+# chunk, so whatever refers to a delta also refers to its chain of bases.
+# Objects are immutable, so sizes and delta bases are recorded in an index in
+# `.datagit/cache` and only objects never seen before are read.
+
+SIZE_CACHE_NAME = "object-sizes-v2"
+
+# Objects read at a time when filling the index.
+READ_BATCH_SIZE = 256
+
+ColumnKey = Tuple[str, str]
+
+def object_info(repo_path: Path, hashes_by_type: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns {"size", "base"} for many objects, where `base` is the base chunk of
+    a delta chunk (None otherwise). Missing objects are absent from the result.
+    """
+    store = objects.get_object_store(repo_path)
+    info: Dict[str, Dict[str, Any]] = {}
+    with cache.KeyValueCache(repo_path, SIZE_CACHE_NAME) as size_index:
+        for obj_type, obj_hashes in hashes_by_type.items():
+            obj_hashes = list(dict.fromkeys(obj_hashes))
+            known = size_index.get_many(obj_hashes)
+            info.update(known)
+            unknown = [h for h in obj_hashes if h not in known]
+            new_info: Dict[str, Dict[str, Any]] = {}
+            if obj_type == "chunk":
+                # Only the content tells a delta chunk apart.
+                for i in range(0, len(unknown), READ_BATCH_SIZE):
+                    for obj_hash, content in store.get_many(obj_type, unknown[i:i + READ_BATCH_SIZE]).items():
+                        new_info[obj_hash] = {"size": len(content), "base": delta_header.delta_base(content)}
+            else:
+                for obj_hash, size in store.sizes_many(obj_type, unknown).items():
+                    new_info[obj_hash] = {"size": size, "base": None}
+            info.update(new_info)
+            if new_info:
+                size_index.put_many(new_info)
+    return info
+
+def reachable_commits(repo_path: Path, start_commits: Iterable[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Returns every commit reachable from `start_commits` through both parents, with its manifest."""
+    commits = []
+    seen = set()
+    queue = deque(start_commits)
+    while queue:
+        commit_hash = queue.popleft()
+        if not commit_hash or commit_hash in seen:
+            continue
+        seen.add(commit_hash)
+        manifest = repository.get_manifest(repo_path, commit_hash)
+        if manifest is None:
+            raise IOError(f"Missing commit '{commit_hash}'.")
+        commits.append((commit_hash, manifest))
+        queue.extend(manifest.get(key) for key in ("parent", "merge_parent"))
+    return commits
+
+class _RecipeWalker:
+    """Expands directory and file recipes into the objects they refer to, reading each recipe once."""
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self.trees: Dict[str, Tuple[FrozenSet[str], Dict[str, str]]] = {}
+        self.files: Dict[str, Dict[str, Tuple[str, List[str]]]] = {}
+
+    def _recipe(self, recipe_hash: str) -> Dict[str, Any]:
+        recipe = repository.get_recipe(self.repo_path, recipe_hash)
+        if recipe is None:
+            raise IOError(f"Missing recipe '{recipe_hash}'.")
+        return recipe
+
+    def tree(self, tree_hash: str) -> Tuple[FrozenSet[str], Dict[str, str]]:
+        """Returns the directory recipes below (and including) a tree and its path -> file recipe mapping."""
+        if tree_hash not in self.trees:
+            dir_recipe = self._recipe(tree_hash)
+            tree_hashes = {tree_hash}
+            files: Dict[str, str] = {}
+            if not repository.is_tree(dir_recipe):
+                files.update(dir_recipe.get("files", {}))
+            for name, entry in dir_recipe.get("entries", {}).items():
+                if entry["type"] == "file":
+                    files[name] = entry["recipe"]
+                    continue
+                subtree_hashes, subtree_files = self.tree(entry["recipe"])
+                tree_hashes |= subtree_hashes
+                files.update((f"{name}/{path}", file_hash) for path, file_hash in subtree_files.items())
+            self.trees[tree_hash] = (frozenset(tree_hashes), files)
+        return self.trees[tree_hash]
+
+    def file(self, file_recipe_hash: str) -> Dict[str, Tuple[str, List[str]]]:
+        """Returns column name -> (column recipe hash, chunk hashes) of a file recipe."""
+        if file_recipe_hash not in self.files:
+            file_recipe = self._recipe(file_recipe_hash)
+            self.files[file_recipe_hash] = {
+                col_info["name"]: (col_info["recipe"], self._recipe(col_info["recipe"]).get("chunks", []))
+                for col_info in file_recipe.get("columns", [])
+            }
+        return self.files[file_recipe_hash]
+
+def _usage(refs: Dict[Any, set], sizes: Dict[str, int]) -> Dict[Any, Dict[str, int]]:
+    """Referenced, unique and shared bytes of every owner, given the objects each owner refers to."""
+    owners = Counter(h for hashes in refs.values() for h in hashes)
+    usage = {}
+    for owner, hashes in refs.items():
+        referenced = sum(sizes.get(h, 0) for h in hashes)
+        unique = sum(sizes.get(h, 0) for h in hashes if owners[h] == 1)
+        usage[owner] = {"referenced": referenced, "unique": unique, "shared": referenced - unique}
+    return usage
+
+def disk_usage(repo_path: Path, start_commits: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Accounts for the storage used by the history of `start_commits` (default:
+    every view and a detached HEAD). Returns `commits` (newest first), `files`
+    ({path: usage}), `columns` ({(path, column): usage}) and `totals`.
+    """
+    if start_commits is None:
+        start_commits = repository.list_refs(repo_path).values()
+    commits = reachable_commits(repo_path, start_commits)
+    walker = _RecipeWalker(repo_path)
+
+    # 1. Collect the objects every commit, file path and column refers to.
+    types: Dict[str, str] = {}
+    commit_refs: Dict[str, set] = {}
+    commit_files: Dict[str, Dict[str, str]] = {}
+    file_refs: Dict[str, set] = {}
+    file_versions: Dict[str, set] = {}
+    column_refs: Dict[ColumnKey, set] = {}
+    for commit_hash, manifest in commits:
+        types[commit_hash] = "manifest"
+        refs = commit_refs[commit_hash] = {commit_hash}
+        files: Dict[str, str] = {}
+        if manifest.get("recipe"):
+            tree_hashes, files = walker.tree(manifest["recipe"])
+            refs.update(tree_hashes)
+            types.update(dict.fromkeys(tree_hashes, "recipe"))
+        commit_files[commit_hash] = files
+
+        for path, file_recipe_hash in files.items():
+            types[file_recipe_hash] = "recipe"
+            refs.add(file_recipe_hash)
+            file_versions.setdefault(path, set()).add(file_recipe_hash)
+            path_refs = file_refs.setdefault(path, set())
+            path_refs.add(file_recipe_hash)
+            for column, (column_recipe_hash, chunks) in walker.file(file_recipe_hash).items():
+                types[column_recipe_hash] = "recipe"
+                types.update(dict.fromkeys(chunks, "chunk"))
+                column_objects = column_refs.setdefault((path, column), set())
+                column_objects.add(column_recipe_hash)
+                column_objects.update(chunks)
+                path_refs.add(column_recipe_hash)
+                path_refs.update(chunks)
+                refs.add(column_recipe_hash)
+                refs.update(chunks)
+
+    # 2. Look up sizes and delta bases, including objects nothing reachable refers to.
+    store = objects.get_object_store(repo_path)
+    stored_hashes = {obj_type: list(store.iterate(obj_type)) for obj_type in ("manifest", "recipe", "chunk")}
+    hashes_by_type: Dict[str, List[str]] = {obj_type: list(hashes) for obj_type, hashes in stored_hashes.items()}
+    for obj_hash, obj_type in types.items():
+        hashes_by_type[obj_type].append(obj_hash)
+    info = object_info(repo_path, hashes_by_type)
+    sizes = {obj_hash: entry["size"] for obj_hash, entry in info.items()}
+
+    # 3. Whatever refers to a delta chunk also refers to the chunks it is based on.
+    base_chains: Dict[str, List[str]] = {}
+    for chunk_hash, entry in info.items():
+        chain, base = [], entry["base"]
+        while base and base not in chain:
+            chain.append(base)
+            base = info.get(base, {}).get("base")
+        if chain:
+            base_chains[chunk_hash] = chain
+    if base_chains:
+        for refs in (*commit_refs.values(), *file_refs.values(), *column_refs.values()):
+            for chunk_hash in [h for h in refs if h in base_chains]:
+                refs.update(base_chains[chunk_hash])
+        for chunk_hash in [h for h, obj_type in types.items() if obj_type == "chunk" and h in base_chains]:
+            types.update(dict.fromkeys(base_chains[chunk_hash], "chunk"))
+
+    # 4. Account per level.
+    file_logical: Dict[str, int] = {}
+    for file_recipe_hash, columns in walker.files.items():
+        file_objects = {file_recipe_hash}
+        for column_recipe_hash, chunks in columns.values():
+            file_objects.add(column_recipe_hash)
+            file_objects.update(chunks)
+            for chunk_hash in chunks:
+                file_objects.update(base_chains.get(chunk_hash, []))
+        file_logical[file_recipe_hash] = sum(sizes.get(h, 0) for h in file_objects)
+
+    commit_usage = _usage(commit_refs, sizes)
+    commit_report = []
+    for commit_hash, manifest in commits:
+        files = commit_files[commit_hash]
+        commit_report.append({
+            "commit": commit_hash,
+            "message": manifest.get("message", ""),
+            "timestamp": manifest.get("timestamp", ""),
+            "files": len(files),
+            "logical": sum(file_logical[h] for h in files.values()),
+            **commit_usage[commit_hash],
+        })
+
+    file_report = _usage(file_refs, sizes)
+    for path, usage in file_report.items():
+        usage["versions"] = len(file_versions[path])
+    column_report = _usage(column_refs, sizes)
+
+    reachable = set(types)
+    reachable_bytes = sum(sizes.get(h, 0) for h in reachable)
+    logical = sum(entry["logical"] for entry in commit_report)
+    stored = {h for hashes in stored_hashes.values() for h in hashes}
+    totals = {
+        "commits": len(commits),
+        "objects": len(reachable),
+        "logical": logical,
+        "reachable": reachable_bytes,
+        "unreachable": sum(sizes.get(h, 0) for h in stored - reachable),
+        "dedup_ratio": logical / reachable_bytes if reachable_bytes else None,
+    }
+    return {"commits": commit_report, "files": file_report, "columns": column_report, "totals": totals}
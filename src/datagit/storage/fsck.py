@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from datagit.storage import cache, delta_header, metadata, objects, repository
+
+# --- INTEGRITY CHECK ---
+# `fsck` walks everything reachable from the views, HEAD and the index:
+#
+#   refs -> manifests (both parents) -> directory trees -> file recipes
+#        -> column recipes -> chunks (-> delta base chunks)
+#
+# Files staged in the index are roots too, so recipes and chunks written by
+# `add` but not committed yet are never reported as dangling.
+#
+# Every object must exist and hash to its name. Recipes and manifests are
+# small and have to be read for the walk anyway, so they are hashed inline.
+# Chunks are re-hashed in a process pool. Chunks that passed once are recorded
+# in a cache, and later runs only re-hash chunks they have never verified
+# (unless a full check is requested); recorded chunks are still checked for
+# existence.
+
+VERIFIED_CACHE_NAME = "fsck-verified"
+
+# Chunks handed to a worker process at a time.
+CHUNKS_PER_TASK = 64
+
+def _verify_chunks(repo_path_str: str, chunk_hashes: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Worker: re-hashes chunks. Returns (hash, status, delta base) per chunk,
+    with status "ok", "missing" or "corrupt".
+    """
+    repo_path = Path(repo_path_str)
+    store = objects.get_object_store(repo_path)
+    results = []
+    for chunk_hash in chunk_hashes:
+        content = store.get("chunk", chunk_hash)
+        if content is None:
+            results.append((chunk_hash, "missing", None))
+            continue
+
+        if not delta_header.is_delta_chunk(content):
+            status = "ok" if hashlib.sha256(content).hexdigest() == chunk_hash else "corrupt"
+            results.append((chunk_hash, status, None))
+            continue
+
+        # A delta chunk is stored under the hash of the full chunk it rebuilds.
+        # Rebuilding it needs the data libraries, so they are only imported here.
+        from datagit.storage import core
+        base = None
+        try:
+            base = delta_header.delta_base(content)
+            series = core.load_chunk(repo_path, chunk_hash)
+            _, rebuilt_hash = core.get_canonical_bytes_and_hash(series)
+            status = "ok" if rebuilt_hash == chunk_hash else "corrupt"
+        except Exception:
+            status = "corrupt"
+        results.append((chunk_hash, status, base))
+    return results
+
+def check_repository(repo_path: Path, full: bool = False, jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Verifies every object reachable from the repository's refs and index. Returns a
+    report with the number of objects checked and lists of problems:
+    `missing` and `corrupt` hold (object type, hash, referenced by) tuples,
+    `dangling` holds (object type, hash) of stored objects nothing refers to.
+    """
+    store = objects.get_object_store(repo_path)
+    report: Dict[str, Any] = {"checked": {}, "rehashed_chunks": 0, "missing": [], "corrupt": [], "dangling": []}
+    reachable: Dict[str, Set[str]] = {"manifest": set(), "recipe": set(), "chunk": set()}
+    chunk_referrers: Dict[str, str] = {}
+
+    def load_json(obj_type: str, obj_hash: str, referrer: str) -> Optional[Dict[str, Any]]:
+        """Reads and verifies a manifest or recipe, recording it as reachable."""
+        reachable[obj_type].add(obj_hash)
+        content = store.get(obj_type, obj_hash)
+        if content is None:
+            report["missing"].append((obj_type, obj_hash, referrer))
+            return None
+        if repository.hash_content(content) != obj_hash:
+            report["corrupt"].append((obj_type, obj_hash, referrer))
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            report["corrupt"].append((obj_type, obj_hash, referrer))
+            return None
+
+    seen_recipes: Set[str] = set()
+
+    def walk_recipes(recipe_queue: deque) -> None:
+        """Reads the given (recipe hash, referrer) pairs and every recipe below them, collecting chunks."""
+        while recipe_queue:
+            recipe_hash, recipe_referrer = recipe_queue.popleft()
+            if not recipe_hash or recipe_hash in seen_recipes:
+                continue
+            seen_recipes.add(recipe_hash)
+            recipe = load_json("recipe", recipe_hash, recipe_referrer)
+            if recipe is None:
+                continue
+            label = f"recipe {recipe_hash[:12]}"
+            for file_recipe_hash in recipe.get("files", {}).values():
+                recipe_queue.append((file_recipe_hash, label))
+            for entry in recipe.get("entries", {}).values():
+                recipe_queue.append((entry["recipe"], label))
+            for col_info in recipe.get("columns", []):
+                recipe_queue.append((col_info["recipe"], label))
+            for chunk_hash in recipe.get("chunks", []):
+                chunk_referrers.setdefault(chunk_hash, label)
+
+    # 1. Walk the commit graph and the recipe trees, then the staged files.
+    queue = deque((commit_hash, name) for name, commit_hash in repository.list_refs(repo_path).items())
+    while queue:
+        commit_hash, referrer = queue.popleft()
+        if commit_hash in reachable["manifest"]:
+            continue
+        manifest = load_json("manifest", commit_hash, referrer)
+        if manifest is None:
+            continue
+        commit_label = f"commit {commit_hash[:12]}"
+        for parent_key in ("parent", "merge_parent"):
+            if manifest.get(parent_key):
+                queue.append((manifest[parent_key], commit_label))
+
+        walk_recipes(deque([(manifest.get("recipe"), commit_label)]))
+
+    walk_recipes(deque((file_recipe_hash, f"index entry '{path}'") for path, file_recipe_hash in metadata.load_index(repo_path).items()))
+
+    # 2. Re-hash chunks, skipping those verified by an earlier run. Delta base
+    # chunks are discovered along the way and checked in a further round.
+    with cache.KeyValueCache(repo_path, VERIFIED_CACHE_NAME) as verified:
+        pending = list(chunk_referrers)
+        while pending:
+            reachable["chunk"].update(pending)
+            known = {} if full else verified.get_many(pending)
+            present = store.has_many("chunk", known)
+            to_verify = [h for h in pending if h not in present]
+
+            newly_verified: Dict[str, Any] = {}
+            next_round: List[str] = []
+            for chunk_hash in known:
+                base = known[chunk_hash].get("base")
+                if chunk_hash in present and base and base not in reachable["chunk"]:
+                    chunk_referrers.setdefault(base, f"delta chunk {chunk_hash[:12]}")
+                    next_round.append(base)
+
+            batches = [to_verify[i:i + CHUNKS_PER_TASK] for i in range(0, len(to_verify), CHUNKS_PER_TASK)]
+            if len(batches) > 1 and jobs != 1:
+                with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+                    results = [r for batch in pool.map(_verify_chunks, [str(repo_path)] * len(batches), batches) for r in batch]
+            else:
+                results = [r for batch in batches for r in _verify_chunks(str(repo_path), batch)]
+
+            for chunk_hash, status, base in results:
+                if status == "ok":
+                    newly_verified[chunk_hash] = {"base": base}
+                else:
+                    report[status].append(("chunk", chunk_hash, chunk_referrers[chunk_hash]))
+                if base and base not in reachable["chunk"]:
+                    # Checked even when the delta is broken, so a missing base shows up as such.
+                    chunk_referrers.setdefault(base, f"delta chunk {chunk_hash[:12]}")
+                    next_round.append(base)
+            report["rehashed_chunks"] += len(results)
+            if newly_verified:
+                verified.put_many(newly_verified)
+            pending = list(dict.fromkeys(h for h in next_round if h not in reachable["chunk"]))
+
+    # 3. Anything stored but never reached is dangling.
+    for obj_type, hashes in reachable.items():
+        report["checked"][obj_type] = len(hashes)
+        for obj_hash in store.iterate(obj_type):
+            if obj_hash not in hashes:
+                report["dangling"].append((obj_type, obj_hash))
+    return report
@@ -0,0 +1,141 @@
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from datagit.storage import cache, metadata
+
+# --- MATERIALIZATION CACHE ---
+# Reconstructed files are kept in `.datagit/cache/materialized/<file recipe hash>`.
+# File recipes are content-addressed, so a cached file is the exact output of
+# reconstructing that recipe and can be dropped into the working tree without
+# touching any chunk. The cache is bounded by total bytes and evicts the least
+# recently used files first.
+#
+# Because a restore may hardlink the cached file into the working tree, an
+# in-place edit of the working file would also change the cached copy. Every
+# entry therefore records the size and mtime of its file, and an entry whose
+# file no longer matches is discarded instead of being restored.
+
+MATERIALIZED_DIR_NAME = "materialized"
+INDEX_NAME = "materialized"
+
+# Values of the `link_mode` setting; see `place_file`.
+LINK_MODES = ("auto", "reflink", "copy")
+
+# ioctl request number of FICLONE on Linux: _IOW(0x94, 9, int).
+FICLONE = 0x40049409
+
+def _settings(repo_path: Path) -> Dict[str, Any]:
+    return metadata.load_config(repo_path)["materialization_cache"]
+
+def is_enabled(repo_path: Path) -> bool:
+    return bool(_settings(repo_path)["enabled"])
+
+def _cache_dir(repo_path: Path) -> Path:
+    cache_dir = cache.get_cache_dir(repo_path) / MATERIALIZED_DIR_NAME
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Creates a copy-on-write clone of `source`, if the platform and filesystem support it."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+
+def place_file(source: Path, destination: Path, link_mode: str = "auto") -> str:
+    """
+    Makes `destination` a copy of `source` as cheaply as possible: a reflink
+    where the filesystem supports it, then a hardlink (only in "auto" mode),
+    then a plain copy. The destination is replaced atomically. Returns the
+    method that was used.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = destination.with_name(f".{destination.name}.datagit-tmp")
+    temp_path.unlink(missing_ok=True)
+
+    method = "copy"
+    if link_mode in ("auto", "reflink") and _reflink(source, temp_path):
+        method = "reflink"
+    elif link_mode == "auto":
+        try:
+            os.link(source, temp_path)
+            method = "hardlink"
+        except OSError:
+            pass
+    if method == "copy":
+        shutil.copyfile(source, temp_path)
+
+    os.replace(temp_path, destination)
+    return method
+
+def _entry_is_valid(path: Path, entry: Dict[str, Any]) -> bool:
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+def restore(repo_path: Path, file_recipe_hash: str, output_path: Path) -> bool:
+    """
+    Places the cached reconstruction of a file recipe at `output_path`.
+    Returns False on a cache miss (or when the cache is disabled).
+    """
+    settings = _settings(repo_path)
+    if not settings["enabled"]:
+        return False
+
+    cached_path = _cache_dir(repo_path) / file_recipe_hash
+    with cache.KeyValueCache(repo_path, INDEX_NAME) as index:
+        entry = index.get(file_recipe_hash)
+        if entry is None:
+            return False
+        if not _entry_is_valid(cached_path, entry):
+            index.delete_many([file_recipe_hash])
+            cached_path.unlink(missing_ok=True)
+            return False
+
+        place_file(cached_path, output_path, settings["link_mode"])
+        entry["last_used"] = time.time()
+        index.put(file_recipe_hash, entry)
+    return True
+
+def store(repo_path: Path, file_recipe_hash: str, output_path: Path) -> None:
+    """Adds a freshly reconstructed file to the cache, then evicts down to the size limit."""
+    settings = _settings(repo_path)
+    if not settings["enabled"] or not output_path.exists():
+        return
+    if output_path.stat().st_size > settings["max_bytes"]:
+        return
+
+    cached_path = _cache_dir(repo_path) / file_recipe_hash
+    place_file(output_path, cached_path, settings["link_mode"])
+    stat = cached_path.stat()
+
+    with cache.KeyValueCache(repo_path, INDEX_NAME) as index:
+        index.put(file_recipe_hash, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "last_used": time.time()})
+        _evict(repo_path, index, settings["max_bytes"])
+
+def _evict(repo_path: Path, index: cache.KeyValueCache, max_bytes: int) -> None:
+    entries = sorted(index.items(), key=lambda item: item[1]["last_used"])
+    total = sum(entry["size"] for _, entry in entries)
+
+    evicted = []
+    for file_recipe_hash, entry in entries:
+        if total <= max_bytes:
+            break
+        (_cache_dir(repo_path) / file_recipe_hash).unlink(missing_ok=True)
+        evicted.append(file_recipe_hash)
+        total -= entry["size"]
+    if evicted:
+        index.delete_many(evicted)
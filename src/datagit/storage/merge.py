@@ -0,0 +1,302 @@
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import polars as pl
+
+from datagit.storage import core, objects, repository, stats
+
+# --- THREE-WAY MERGE ---
+# Merges work at three levels of the Merkle tree, always by hash first:
+#
+#   1. file recipes   - a file changed on one side only is taken as-is.
+#   2. column recipes - within a file changed on both sides, so are columns.
+#   3. chunk hashes   - within a column changed on both sides, so are chunks.
+#
+# Only chunks at the same position that changed on both sides are decoded and
+# merged cell by cell. Chunks cover fixed row ranges (CHUNK_ROW_SIZE rows), so
+# chunk i of every version of a column holds the same row positions.
+#
+# Merged chunks and recipes are collected in memory and only written once the
+# whole merge turned out free of conflicts, so an aborted merge leaves nothing
+# behind.
+
+Conflict = Dict[str, Any]
+
+# Objects a merge creates, keyed by (object type, hash), waiting to be written.
+NewObjects = Dict[Tuple[str, str], bytes]
+
+def _parents(manifest: Dict[str, Any]) -> List[str]:
+    return [p for p in (manifest.get("parent"), manifest.get("merge_parent")) if p]
+
+def find_merge_base(repo_path: Path, ours: str, theirs: str) -> Optional[str]:
+    """
+    Finds the nearest common ancestor of two commits by walking the manifest
+    parent chains (including the second parent of merge commits).
+    """
+    ancestors: Set[str] = set()
+    queue = deque([ours])
+    while queue:
+        commit_hash = queue.popleft()
+        if commit_hash in ancestors:
+            continue
+        ancestors.add(commit_hash)
+        manifest = repository.get_manifest(repo_path, commit_hash)
+        if manifest:
+            queue.extend(_parents(manifest))
+
+    seen: Set[str] = set()
+    queue = deque([theirs])
+    while queue:
+        commit_hash = queue.popleft()
+        if commit_hash in ancestors:
+            return commit_hash
+        if commit_hash in seen:
+            continue
+        seen.add(commit_hash)
+        manifest = repository.get_manifest(repo_path, commit_hash)
+        if manifest:
+            queue.extend(_parents(manifest))
+    return None
+
+def _three_way(base: Any, ours: Any, theirs: Any) -> Tuple[bool, Any]:
+    """Resolves a value by identity. Returns (resolved, value)."""
+    if ours == theirs:
+        return True, ours
+    if base == ours:
+        return True, theirs
+    if base == theirs:
+        return True, ours
+    return False, None
+
+def _merge_chunk_cells(
+    repo_path: Path, column: str, chunk_index: int, base_hash: Optional[str], ours_hash: Optional[str], theirs_hash: Optional[str]
+) -> Tuple[Optional[pl.Series], List[Tuple[int, int]]]:
+    """
+    Merges one chunk that changed on both sides, cell by cell. Returns the merged
+    chunk (None on conflict) and the conflicting row ranges.
+    """
+    first_row = chunk_index * core.CHUNK_ROW_SIZE
+    versions = [core.load_chunk(repo_path, h) if h else None for h in (base_hash, ours_hash, theirs_hash)]
+    base, ours, theirs = versions
+
+    if ours is None or theirs is None or ours.len() != theirs.len() or (base is not None and base.len() != ours.len()):
+        # Rows were added or removed on both sides; there is no cell alignment to rely on.
+        length = max(v.len() for v in versions if v is not None)
+        return None, [(first_row, first_row + length)]
+    if ours.dtype != theirs.dtype or (base is not None and base.dtype != ours.dtype):
+        return None, [(first_row, first_row + ours.len())]
+    if base is None:
+        base = pl.Series([None] * ours.len(), dtype=ours.dtype)
+
+    frame = pl.DataFrame({"base": base, "ours": ours, "theirs": theirs})
+    same = pl.col("ours").eq_missing(pl.col("theirs"))
+    ours_unchanged = pl.col("base").eq_missing(pl.col("ours"))
+    theirs_unchanged = pl.col("base").eq_missing(pl.col("theirs"))
+    merged = frame.select(
+        pl.when(same | theirs_unchanged).then(pl.col("ours")).otherwise(pl.col("theirs")).alias("merged"),
+        (~(same | ours_unchanged | theirs_unchanged)).alias("conflict"),
+    )
+
+    conflict_rows = merged["conflict"].arg_true().to_list()
+    if conflict_rows:
+        ranges: List[Tuple[int, int]] = []
+        for row in conflict_rows:
+            if ranges and ranges[-1][1] == first_row + row:
+                ranges[-1] = (ranges[-1][0], first_row + row + 1)
+            else:
+                ranges.append((first_row + row, first_row + row + 1))
+        return None, ranges
+    return merged["merged"].alias(column), []
+
+def _merge_columns(
+    repo_path: Path,
+    file_path: str,
+    column: str,
+    base_recipe: Optional[Dict[str, Any]],
+    ours_recipe: Dict[str, Any],
+    theirs_recipe: Dict[str, Any],
+    conflicts: List[Conflict],
+    new_objects: NewObjects,
+) -> Optional[Tuple[str, int]]:
+    """
+    Merges two versions of a column at chunk granularity. Returns the new
+    column recipe hash and the column's row count.
+    """
+    sides = {"ours": ours_recipe, "theirs": theirs_recipe, "base": base_recipe or {}}
+    chunk_count = max(len(ours_recipe["chunks"]), len(theirs_recipe["chunks"]))
+
+    merged_chunks: List[str] = []
+    merged_stats: Optional[List[Dict[str, Any]]] = []
+    rows = 0
+    had_conflict = False
+    ended = False
+
+    for i in range(chunk_count):
+        hashes = {
+            name: (recipe.get("chunks", [])[i] if i < len(recipe.get("chunks", [])) else None)
+            for name, recipe in sides.items()
+        }
+        resolved, chunk_hash = _three_way(hashes["base"], hashes["ours"], hashes["theirs"])
+
+        if resolved:
+            if chunk_hash is None:
+                ended = True
+                continue
+            source = next(sides[name] for name in ("ours", "theirs", "base") if hashes[name] == chunk_hash)
+            source_stats = source.get("stats")
+            if source_stats and i < len(source_stats) and "rows" in source_stats[i]:
+                chunk_rows = source_stats[i]["rows"]
+            else:
+                chunk_series = core.load_chunk(repo_path, chunk_hash)
+                chunk_rows = chunk_series.len() if chunk_series is not None else 0
+            if merged_stats is not None and source_stats and i < len(source_stats):
+                merged_stats.append(source_stats[i])
+            else:
+                merged_stats = None
+        else:
+            merged_series, ranges = _merge_chunk_cells(repo_path, column, i, hashes["base"], hashes["ours"], hashes["theirs"])
+            if merged_series is None:
+                had_conflict = True
+                conflicts.extend({"file": file_path, "column": column, "rows": r} for r in ranges)
+                continue
+            content, chunk_hash = core.get_canonical_bytes_and_hash(merged_series)
+            new_objects[("chunk", chunk_hash)] = content
+            chunk_rows = merged_series.len()
+            if merged_stats is not None:
+                merged_stats.append(stats.compute_chunk_stats(merged_series))
+
+        if ended:
+            # One side dropped trailing chunks while the other changed a later one.
+            had_conflict = True
+            conflicts.append({"file": file_path, "column": column, "rows": (i * core.CHUNK_ROW_SIZE, None)})
+            continue
+        merged_chunks.append(chunk_hash)
+        rows += chunk_rows
+
+    if had_conflict:
+        return None
+    dtype_descriptor = ours_recipe.get("dtype", theirs_recipe.get("dtype"))
+    content = core.column_recipe_content(merged_chunks, merged_stats, dtype_descriptor)
+    col_recipe_hash = repository.hash_content(content)
+    new_objects[("recipe", col_recipe_hash)] = content
+    return col_recipe_hash, rows
+
+def _column_rows(repo_path: Path, col_recipe_hash: str) -> Optional[int]:
+    """Counts the rows of a stored column, from its zone maps or else its last chunk."""
+    col_recipe = repository.get_recipe(repo_path, col_recipe_hash)
+    if col_recipe is None:
+        return None
+    chunks = col_recipe.get("chunks", [])
+    chunk_stats = col_recipe.get("stats") or []
+    if len(chunk_stats) == len(chunks) and all("rows" in entry for entry in chunk_stats):
+        return sum(entry["rows"] for entry in chunk_stats)
+    if not chunks:
+        return 0
+    last_chunk = core.load_chunk(repo_path, chunks[-1])
+    return (len(chunks) - 1) * core.CHUNK_ROW_SIZE + (last_chunk.len() if last_chunk is not None else 0)
+
+def _merge_file_recipes(
+    repo_path: Path,
+    file_path: str,
+    base_hash: Optional[str],
+    ours_hash: str,
+    theirs_hash: str,
+    conflicts: List[Conflict],
+    new_objects: NewObjects,
+) -> Optional[str]:
+    """Merges two versions of a file at column granularity. Returns the new file recipe hash."""
+    recipes = [repository.get_recipe(repo_path, h) if h else None for h in (base_hash, ours_hash, theirs_hash)]
+    base, ours, theirs = [r or {"columns": [], "column_order": []} for r in recipes]
+    if ours.get("type") != "columnar" or theirs.get("type") != "columnar":
+        conflicts.append({"file": file_path, "column": None, "rows": None})
+        return None
+
+    columns = {
+        name: {c["name"]: c for c in recipe["columns"]}
+        for name, recipe in (("base", base), ("ours", ours), ("theirs", theirs))
+    }
+    names = set(columns["base"]) | set(columns["ours"]) | set(columns["theirs"])
+
+    merged_columns = []
+    column_rows: Dict[str, Optional[int]] = {}
+    conflict_count = len(conflicts)
+    for column in sorted(names):
+        entries = {side: columns[side].get(column) for side in columns}
+        hashes = {side: entry["recipe"] if entry else None for side, entry in entries.items()}
+        resolved, col_recipe_hash = _three_way(hashes["base"], hashes["ours"], hashes["theirs"])
+
+        if resolved:
+            if col_recipe_hash is not None:
+                entry = next(e for e in entries.values() if e and e["recipe"] == col_recipe_hash)
+                merged_columns.append(entry)
+                column_rows[column] = _column_rows(repo_path, col_recipe_hash)
+            continue
+        if hashes["ours"] is None or hashes["theirs"] is None:
+            # Deleted on one side, changed on the other.
+            conflicts.append({"file": file_path, "column": column, "rows": None})
+            continue
+
+        col_recipes = {side: repository.get_recipe(repo_path, h) if h else None for side, h in hashes.items()}
+        merged = _merge_columns(
+            repo_path, file_path, column, col_recipes["base"], col_recipes["ours"], col_recipes["theirs"], conflicts, new_objects
+        )
+        if merged:
+            merged_hash, column_rows[column] = merged
+            dtype_descriptor = entries["ours"].get("dtype", col_recipes["ours"].get("dtype"))
+            merged_columns.append({"name": column, "recipe": merged_hash, "dtype": dtype_descriptor})
+
+    if len(conflicts) > conflict_count:
+        return None
+    if len(set(column_rows.values())) > 1:
+        # Each column merged cleanly, but not into the same number of rows: e.g.
+        # one side appended rows while the other added a column.
+        conflicts.append({"file": file_path, "column": None, "rows": None})
+        return None
+
+    # Keep our column order, followed by columns only the other side added.
+    merged_names = {c["name"] for c in merged_columns}
+    column_order = [c for c in ours["column_order"] if c in merged_names]
+    column_order += [c for c in theirs["column_order"] if c in merged_names and c not in column_order]
+    content = core.file_recipe_content(column_order, merged_columns)
+    file_recipe_hash = repository.hash_content(content)
+    new_objects[("recipe", file_recipe_hash)] = content
+    return file_recipe_hash
+
+def merge_commits(repo_path: Path, base: Optional[str], ours: str, theirs: str) -> Tuple[Dict[str, str], List[Conflict], NewObjects]:
+    """
+    Three-way merges the files of two commits against their merge base.
+    Returns the merged file map, the list of conflicts and the new objects the
+    merged files refer to. Nothing is written: the merge is only valid if there
+    are no conflicts, and then `save_new_objects` stores it.
+    """
+    files = {
+        "base": repository.get_commit_files(repo_path, base),
+        "ours": repository.get_commit_files(repo_path, ours),
+        "theirs": repository.get_commit_files(repo_path, theirs),
+    }
+    merged: Dict[str, str] = {}
+    conflicts: List[Conflict] = []
+    new_objects: NewObjects = {}
+
+    for file_path in sorted(set(files["base"]) | set(files["ours"]) | set(files["theirs"])):
+        b, o, t = (files[side].get(file_path) for side in ("base", "ours", "theirs"))
+        resolved, file_recipe_hash = _three_way(b, o, t)
+        if not resolved:
+            if o is None or t is None:
+                conflicts.append({"file": file_path, "column": None, "rows": None})
+                continue
+            file_recipe_hash = _merge_file_recipes(repo_path, file_path, b, o, t, conflicts, new_objects)
+        if file_recipe_hash:
+            merged[file_path] = file_recipe_hash
+    return merged, conflicts, new_objects
+
+def save_new_objects(repo_path: Path, new_objects: NewObjects) -> None:
+    """Writes the objects created by a conflict-free merge."""
+    store = objects.get_object_store(repo_path)
+    with store.batch():
+        for (obj_type, obj_hash), content in new_objects.items():
+            if obj_type == "chunk":
+                core.save_chunk_if_needed(repo_path, obj_hash, content)
+            else:
+                repository.save_object(repo_path, content, "recipes")
@@ -1,3 +1,4 @@
+import copy
 import json
 from pathlib import Path
 from typing import Dict, Any
@@ -49,3 +50,45 @@ def save_schemas(repo_path: Path, schemas: Dict[str, Any]) -> None:
     schema_path = repo_path / "schemas.json"
     schema_path.write_text(json.dumps(schemas, indent=2))
 
+# --- Configuration (config.json) ---
+
+# Every supported setting with its default. Missing keys in `config.json`
+# fall back to these, so repositories created before a setting existed keep working.
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "materialization_cache": {
+        # Keep reconstructed files in `.datagit/cache/materialized` for fast restores.
+        "enabled": False,
+        "max_bytes": 1024 ** 3,
+        # "auto" tries reflink, then hardlink, then copy; "reflink" never hardlinks; "copy" always copies.
+        "link_mode": "auto",
+    },
+    "delta_chunks": {
+        # Store chunks that changed in a few cells as deltas against the parent commit's chunk.
+        "enabled": False,
+        # Longest allowed delta chain; the next version is stored in full.
+        "max_depth": 8,
+    },
+    # Where recipes and manifests live: "loose" files or a single "sqlite" database.
+    "object_store": "loose",
+}
+
+def _merge_config(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def load_config(repo_path: Path) -> Dict[str, Any]:
+    """Loads the repository configuration (`config.json`) on top of the defaults."""
+    config_path = repo_path / "config.json"
+    if config_path.exists():
+        return _merge_config(DEFAULT_CONFIG, json.loads(config_path.read_text()))
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+def save_config(repo_path: Path, config: Dict[str, Any]) -> None:
+    """Saves the repository configuration file."""
+    config_path = repo_path / "config.json"
+    config_path.write_text(json.dumps(config, indent=2))
@@ -0,0 +1,340 @@
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from datagit.storage import metadata
+
+# --- OBJECT STORES ---
+# Every object (chunk, recipe, manifest) is addressed by its type and hash.
+# All storage code reads and writes objects through an `ObjectStore`, so the
+# physical layout can change without touching the rest of the code:
+#
+#   loose  - one file per object in `.datagit/<type>s/<hash>` (the original layout).
+#   sqlite - recipes and manifests in a single `.datagit/objects.db`; chunks stay
+#            loose because they are large and benefit from living in plain files.
+#   memory - a dict, for benchmarks and experiments.
+#
+# Object types are the singular names "chunk", "recipe" and "manifest"; plural
+# directory names ("recipes") are accepted too.
+
+OBJECT_STORE_BACKENDS = ("loose", "sqlite")
+SQLITE_DB_NAME = "objects.db"
+SQLITE_OBJECT_TYPES = ("recipe", "manifest")
+
+# SQLite limits the number of bound parameters per statement.
+SQLITE_BATCH_SIZE = 500
+
+def _type(obj_type: str) -> str:
+    return obj_type.rstrip("s")
+
+class ObjectStore(ABC):
+    """The interface every object store implements."""
+
+    @abstractmethod
+    def get(self, obj_type: str, obj_hash: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, obj_type: str, obj_hash: str, content: bytes) -> bool:
+        """Stores an object unless it exists. Returns True if it was written."""
+        raise NotImplementedError
+
+    def has(self, obj_type: str, obj_hash: str) -> bool:
+        return bool(self.has_many(obj_type, [obj_hash]))
+
+    def has_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Set[str]:
+        """Returns the subset of `obj_hashes` that exist."""
+        return {h for h in obj_hashes if self.get(obj_type, h) is not None}
+
+    def get_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, bytes]:
+        """Reads many objects at once; missing objects are absent from the result."""
+        found = {}
+        for obj_hash in obj_hashes:
+            content = self.get(obj_type, obj_hash)
+            if content is not None:
+                found[obj_hash] = content
+        return found
+
+    def sizes_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, int]:
+        """Returns the stored size in bytes of many objects; missing objects are absent from the result."""
+        return {h: len(content) for h, content in self.get_many(obj_type, obj_hashes).items()}
+
+    @abstractmethod
+    def iterate(self, obj_type: str) -> Iterator[str]:
+        """Yields the hash of every stored object of a type."""
+        raise NotImplementedError
+
+    @contextmanager
+    def batch(self) -> Iterator["ObjectStore"]:
+        """Groups writes; backends that support transactions commit them together."""
+        yield self
+
+    def close(self) -> None:
+        pass
+
+class LooseObjectStore(ObjectStore):
+    """One file per object in `<repo>/<type>s/<hash>`."""
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+
+    def _path(self, obj_type: str, obj_hash: str) -> Path:
+        return self.repo_path / f"{_type(obj_type)}s" / obj_hash
+
+    def get(self, obj_type: str, obj_hash: str) -> Optional[bytes]:
+        try:
+            return self._path(obj_type, obj_hash).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, obj_type: str, obj_hash: str, content: bytes) -> bool:
+        obj_path = self._path(obj_type, obj_hash)
+        if obj_path.exists():
+            return False
+        obj_path.parent.mkdir(exist_ok=True)
+        obj_path.write_bytes(content)
+        return True
+
+    def has_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Set[str]:
+        return {h for h in obj_hashes if self._path(obj_type, h).exists()}
+
+    def sizes_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, int]:
+        sizes = {}
+        for obj_hash in obj_hashes:
+            try:
+                sizes[obj_hash] = self._path(obj_type, obj_hash).stat().st_size
+            except FileNotFoundError:
+                pass
+        return sizes
+
+    def iterate(self, obj_type: str) -> Iterator[str]:
+        obj_dir = self.repo_path / f"{_type(obj_type)}s"
+        if not obj_dir.is_dir():
+            return
+        with os.scandir(obj_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield entry.name
+
+class MemoryObjectStore(ObjectStore):
+    """Keeps every object in a dict. Nothing is persisted."""
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+
+    def get(self, obj_type: str, obj_hash: str) -> Optional[bytes]:
+        return self.objects.get((_type(obj_type), obj_hash))
+
+    def put(self, obj_type: str, obj_hash: str, content: bytes) -> bool:
+        key = (_type(obj_type), obj_hash)
+        if key in self.objects:
+            return False
+        self.objects[key] = content
+        return True
+
+    def has_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Set[str]:
+        return {h for h in obj_hashes if (_type(obj_type), h) in self.objects}
+
+    def iterate(self, obj_type: str) -> Iterator[str]:
+        obj_type = _type(obj_type)
+        for stored_type, obj_hash in list(self.objects):
+            if stored_type == obj_type:
+                yield obj_hash
+
+class SQLiteObjectStore(ObjectStore):
+    """
+    Stores small objects as rows of `.datagit/objects.db`. Other types, and
+    objects written before the repository switched to this backend, are read
+    from (and other types written to) the loose layout.
+    """
+
+    def __init__(self, repo_path: Path, object_types: Iterable[str] = SQLITE_OBJECT_TYPES):
+        self.loose = LooseObjectStore(repo_path)
+        self.object_types = {_type(t) for t in object_types}
+        # Autocommit mode: transactions are opened explicitly by `batch()`. Lazy
+        # query scans read objects from worker threads, hence the shared connection and lock.
+        self.connection = sqlite3.connect(repo_path / SQLITE_DB_NAME, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "type TEXT NOT NULL, hash TEXT NOT NULL, content BLOB NOT NULL, PRIMARY KEY (type, hash)"
+            ") WITHOUT ROWID"
+        )
+        self._batch_depth = 0
+
+    def _inline(self, obj_type: str) -> bool:
+        return _type(obj_type) in self.object_types
+
+    def get(self, obj_type: str, obj_hash: str) -> Optional[bytes]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT content FROM objects WHERE type = ? AND hash = ?", (_type(obj_type), obj_hash)
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        return self.loose.get(obj_type, obj_hash)
+
+    def put(self, obj_type: str, obj_hash: str, content: bytes) -> bool:
+        if not self._inline(obj_type):
+            return self.loose.put(obj_type, obj_hash, content)
+        if self.loose.has(obj_type, obj_hash):
+            return False
+        with self.lock:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO objects (type, hash, content) VALUES (?, ?, ?)", (_type(obj_type), obj_hash, content)
+            )
+            return cursor.rowcount > 0
+
+    def has_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Set[str]:
+        obj_hashes = list(dict.fromkeys(obj_hashes))
+        found: Set[str] = set()
+        for i in range(0, len(obj_hashes), SQLITE_BATCH_SIZE):
+            batch = obj_hashes[i:i + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT hash FROM objects WHERE type = ? AND hash IN ({placeholders})", [_type(obj_type), *batch]
+                ).fetchall()
+            found.update(row[0] for row in rows)
+        return found | self.loose.has_many(obj_type, [h for h in obj_hashes if h not in found])
+
+    def get_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, bytes]:
+        obj_hashes = list(dict.fromkeys(obj_hashes))
+        found: Dict[str, bytes] = {}
+        for i in range(0, len(obj_hashes), SQLITE_BATCH_SIZE):
+            batch = obj_hashes[i:i + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT hash, content FROM objects WHERE type = ? AND hash IN ({placeholders})", [_type(obj_type), *batch]
+                ).fetchall()
+            found.update(rows)
+        found.update(self.loose.get_many(obj_type, [h for h in obj_hashes if h not in found]))
+        return found
+
+    def sizes_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, int]:
+        obj_hashes = list(dict.fromkeys(obj_hashes))
+        sizes: Dict[str, int] = {}
+        for i in range(0, len(obj_hashes), SQLITE_BATCH_SIZE):
+            batch = obj_hashes[i:i + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT hash, length(content) FROM objects WHERE type = ? AND hash IN ({placeholders})", [_type(obj_type), *batch]
+                ).fetchall()
+            sizes.update(rows)
+        sizes.update(self.loose.sizes_many(obj_type, [h for h in obj_hashes if h not in sizes]))
+        return sizes
+
+    def iterate(self, obj_type: str) -> Iterator[str]:
+        with self.lock:
+            rows = self.connection.execute("SELECT hash FROM objects WHERE type = ?", (_type(obj_type),)).fetchall()
+        stored = {row[0] for row in rows}
+        yield from stored
+        for obj_hash in self.loose.iterate(obj_type):
+            if obj_hash not in stored:
+                yield obj_hash
+
+    @contextmanager
+    def batch(self) -> Iterator["ObjectStore"]:
+        # The lock is held for the whole transaction so other threads can't interleave writes.
+        with self.lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self.connection.execute("BEGIN")
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    self.connection.execute("ROLLBACK")
+                raise
+            else:
+                if self._batch_depth == 1:
+                    self.connection.execute("COMMIT")
+            finally:
+                self._batch_depth -= 1
+
+    def close(self) -> None:
+        self.connection.close()
+
+class CachingObjectStore(ObjectStore):
+    """
+    Wraps another store and keeps every recipe and manifest it reads in memory.
+    Objects are immutable, so cached entries never go stale. Meant for
+    long-running processes such as the daemon.
+    """
+
+    def __init__(self, inner: ObjectStore, object_types: Iterable[str] = SQLITE_OBJECT_TYPES):
+        self.inner = inner
+        self.object_types = {_type(t) for t in object_types}
+        self.cached: Dict[Tuple[str, str], bytes] = {}
+
+    def get(self, obj_type: str, obj_hash: str) -> Optional[bytes]:
+        key = (_type(obj_type), obj_hash)
+        content = self.cached.get(key)
+        if content is None:
+            content = self.inner.get(obj_type, obj_hash)
+            if content is not None and key[0] in self.object_types:
+                self.cached[key] = content
+        return content
+
+    def put(self, obj_type: str, obj_hash: str, content: bytes) -> bool:
+        return self.inner.put(obj_type, obj_hash, content)
+
+    def has_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Set[str]:
+        obj_hashes = list(obj_hashes)
+        found = {h for h in obj_hashes if (_type(obj_type), h) in self.cached}
+        return found | self.inner.has_many(obj_type, [h for h in obj_hashes if h not in found])
+
+    def get_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, bytes]:
+        return self.inner.get_many(obj_type, obj_hashes)
+
+    def sizes_many(self, obj_type: str, obj_hashes: Iterable[str]) -> Dict[str, int]:
+        return self.inner.sizes_many(obj_type, obj_hashes)
+
+    def iterate(self, obj_type: str) -> Iterator[str]:
+        return self.inner.iterate(obj_type)
+
+    def batch(self):
+        return self.inner.batch()
+
+    def close(self) -> None:
+        self.inner.close()
+
+# --- BACKEND SELECTION ---
+
+_open_stores: Dict[Tuple[int, Path], ObjectStore] = {}
+
+def open_object_store(repo_path: Path, backend: str) -> ObjectStore:
+    """Opens a new object store of the given backend for a repository."""
+    if backend == "loose":
+        if (repo_path / SQLITE_DB_NAME).exists():
+            # The repository used the SQLite backend before: keep reading those
+            # objects, but write every new object loose.
+            return SQLiteObjectStore(repo_path, object_types=())
+        return LooseObjectStore(repo_path)
+    if backend == "sqlite":
+        return SQLiteObjectStore(repo_path)
+    raise RuntimeError(f"Unknown object store '{backend}'. Expected one of: {', '.join(OBJECT_STORE_BACKENDS)}.")
+
+def get_object_store(repo_path: Path) -> ObjectStore:
+    """
+    Returns the repository's object store, as selected by the `object_store`
+    setting. Stores are opened once per process.
+    """
+    # Keyed by process id as well: a forked worker must not share its parent's SQLite connection.
+    key = (os.getpid(), repo_path.resolve())
+    store = _open_stores.get(key)
+    if store is None:
+        store = _open_stores[key] = open_object_store(repo_path, metadata.load_config(repo_path)["object_store"])
+    return store
+
+def cache_object_reads(repo_path: Path) -> None:
+    """Makes this process keep the recipes and manifests it reads in memory."""
+    store = get_object_store(repo_path)
+    if not isinstance(store, CachingObjectStore):
+        _open_stores[(os.getpid(), repo_path.resolve())] = CachingObjectStore(store)
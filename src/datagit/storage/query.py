@@ -0,0 +1,143 @@
+import datetime
+import json
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterator, List, Optional
+
+import polars as pl
+from polars.io.plugins import register_io_source
+
+from datagit.storage import core, repository, stats
+
+# --- PREDICATE TRANSLATION ---
+# Polars hands the scan a predicate expression. Its serialized form is walked
+# to extract the conjuncts that zone maps can prune on. Anything that isn't
+# understood is simply left out: the full predicate is still applied to every
+# decoded batch, so the translation only has to be conservative, not complete.
+
+_COMPARISON_OPS = {"Eq": "==", "NotEq": "!=", "Lt": "<", "LtEq": "<=", "Gt": ">", "GtEq": ">="}
+_FLIPPED_OPS = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+_TIME_UNITS = {"Nanoseconds": "ns", "Microseconds": "us", "Milliseconds": "ms"}
+
+class _Untranslatable(Exception):
+    pass
+
+def _literal_value(node: Dict[str, Any]) -> Any:
+    literal = node["Literal"]
+    if "Dyn" in literal:
+        (value,) = literal["Dyn"].values()
+        return value
+    if "Scalar" not in literal:
+        raise _Untranslatable()
+
+    ((kind, value),) = literal["Scalar"].items()
+    if kind == "Date":
+        return datetime.date(1970, 1, 1) + datetime.timedelta(days=value)
+    if kind == "Datetime":
+        ticks, unit, time_zone = value
+        return pl.Series([ticks]).cast(pl.Datetime(_TIME_UNITS[unit], time_zone)).item()
+    if kind in ("String", "Boolean") or kind.startswith(("Int", "UInt", "Float")):
+        return value
+    raise _Untranslatable()
+
+def _translate(node: Dict[str, Any], filters: List[stats.Filter]) -> None:
+    if "BinaryExpr" in node:
+        binary = node["BinaryExpr"]
+        op, left, right = binary["op"], binary["left"], binary["right"]
+        if op in ("And", "LogicalAnd"):
+            for side in (left, right):
+                try:
+                    _translate(side, filters)
+                except (_Untranslatable, KeyError, TypeError, ValueError):
+                    pass
+            return
+        if op in _COMPARISON_OPS:
+            if "Column" in left and "Literal" in right:
+                filters.append((left["Column"], _COMPARISON_OPS[op], _literal_value(right)))
+                return
+            if "Literal" in left and "Column" in right:
+                filters.append((right["Column"], _FLIPPED_OPS[_COMPARISON_OPS[op]], _literal_value(left)))
+                return
+        raise _Untranslatable()
+
+    if "Function" in node:
+        function, inputs = node["Function"]["function"], node["Function"]["input"]
+        boolean = function.get("Boolean") if isinstance(function, dict) else None
+        if boolean in ("IsNull", "IsNotNull") and "Column" in inputs[0]:
+            filters.append((inputs[0]["Column"], "is_null" if boolean == "IsNull" else "is_not_null", None))
+            return
+        if isinstance(boolean, dict) and "IsBetween" in boolean and "Column" in inputs[0]:
+            filters.append((inputs[0]["Column"], "between", (_literal_value(inputs[1]), _literal_value(inputs[2]))))
+            return
+    raise _Untranslatable()
+
+def predicate_to_filters(predicate: Optional[pl.Expr]) -> List[stats.Filter]:
+    """Extracts zone-map filters from a pushed-down predicate (an implicit AND of them)."""
+    if predicate is None:
+        return []
+    filters: List[stats.Filter] = []
+    try:
+        _translate(json.loads(predicate.meta.serialize(format="json")), filters)
+    except Exception:
+        pass
+    return filters
+
+# --- SCAN SOURCES ---
+
+def scan_file_recipe(repo_path: Path, file_recipe: Dict[str, Any]) -> pl.LazyFrame:
+    """
+    Exposes a versioned file as a LazyFrame backed directly by the chunk store.
+    Projections limit which column recipes are read; predicates limit which
+    chunks are decoded. Nothing is written to the working directory.
+    """
+    schema = core.get_file_schema(repo_path, file_recipe)
+
+    def source(
+        with_columns: Optional[List[str]],
+        predicate: Optional[pl.Expr],
+        n_rows: Optional[int],
+        batch_size: Optional[int],
+    ) -> Iterator[pl.DataFrame]:
+        columns = list(with_columns) if with_columns is not None else list(schema)
+        read_columns = list(columns)
+        if predicate is not None:
+            read_columns += [c for c in predicate.meta.root_names() if c not in read_columns]
+        filters = [f for f in predicate_to_filters(predicate) if f[0] in schema]
+
+        remaining = n_rows
+        for batch in core.iter_file_batches(repo_path, file_recipe, read_columns, filters):
+            if predicate is not None:
+                batch = batch.filter(predicate)
+            batch = batch.select(columns)
+            if remaining is not None:
+                batch = batch.head(remaining)
+                remaining -= batch.height
+            yield batch
+            if remaining is not None and remaining <= 0:
+                break
+
+    return register_io_source(source, schema=schema)
+
+def table_names_for_files(file_paths: List[str]) -> Dict[str, str]:
+    """
+    Maps SQL table names to tracked file paths. Every file is reachable by its
+    full path (as a quoted identifier) and, when it is unambiguous, by its stem,
+    so `data/sales.csv` can be queried as `sales`.
+    """
+    tables = {path: path for path in file_paths}
+    stems: Dict[str, List[str]] = {}
+    for path in file_paths:
+        stems.setdefault(PurePosixPath(path.replace("\\", "/")).stem, []).append(path)
+    for stem, paths in stems.items():
+        if len(paths) == 1 and stem not in tables:
+            tables[stem] = paths[0]
+    return tables
+
+def build_sql_context(repo_path: Path, commit_hash: str) -> pl.SQLContext:
+    """Registers every file of a commit as a table of a Polars SQL context."""
+    files = repository.get_commit_files(repo_path, commit_hash)
+    context = pl.SQLContext()
+    for table_name, file_path in table_names_for_files(sorted(files)).items():
+        file_recipe = repository.get_recipe(repo_path, files[file_path])
+        if file_recipe and file_recipe.get("type") == "columnar":
+            context.register(table_name, scan_file_recipe(repo_path, file_recipe))
+    return context
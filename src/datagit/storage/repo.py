@@ -12,3 +12,13 @@ def find_repo(start: Path = Path.cwd()) -> Optional[Path]:
         if (parent / ".datagit").exists():
             return parent / ".datagit"
     return None
+
+def relative_path(repo_path: Path, path: Path) -> Optional[str]:
+    """
+    Returns a path (absolute or relative to the current directory) relative to
+    the repository root, or None if it lies outside the repository.
+    """
+    try:
+        return str(path.resolve().relative_to(repo_path.parent.resolve()))
+    except ValueError:
+        return None
@@ -1,10 +1,9 @@
+import hashlib
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-# The 'metadata' import is no longer needed for resolving the current commit,
-# but we will keep it for its other utility functions like managing the index.
-from datagit.storage import metadata
+from datagit.storage import objects
 from rich.console import Console
 
 # It's good practice to have a console object available for potential errors.
@@ -12,12 +11,18 @@ console = Console()
 
 def get_object(repo_path: Path, obj_hash: str, obj_type: str) -> Optional[bytes]:
     """Reads an object's content from storage by its hash."""
-    obj_dir_name = f"{obj_type.rstrip('s')}s"
-    obj_dir = repo_path / obj_dir_name
-    obj_path = obj_dir / obj_hash
-    if obj_path.exists():
-        return obj_path.read_bytes()
-    return None
+    return objects.get_object_store(repo_path).get(obj_type, obj_hash)
+
+def hash_content(content: bytes) -> str:
+    """Computes the SHA-256 hash of byte content for recipes and manifests."""
+    return hashlib.sha256(content).hexdigest()
+
+def save_object(repo_path: Path, content: bytes, obj_type_dir: str) -> str:
+    """Hashes and saves non-chunk objects like recipes and manifests."""
+    content_hash = hash_content(content)
+    if objects.get_object_store(repo_path).put(obj_type_dir, content_hash, content):
+        console.log(f"[yellow]  -> Saving new {obj_type_dir.rstrip('s')} object:[/yellow] [cyan]{content_hash[:12]}[/cyan]")
+    return content_hash
 
 def get_recipe(repo_path: Path, recipe_hash: str) -> Optional[Dict[str, Any]]:
     """Retrieves and deserializes a recipe object."""
@@ -86,24 +91,205 @@ def update_current_view_head(repo_path: Path, commit_hash: str):
     view_file = repo_path / "refs" / "heads" / view_name
     view_file.write_text(commit_hash)
 
+def list_refs(repo_path: Path) -> Dict[str, str]:
+    """Returns every named starting point of history: the views and a detached HEAD."""
+    refs = {}
+    heads_dir = repo_path / "refs" / "heads"
+    if heads_dir.is_dir():
+        for view_file in sorted(heads_dir.iterdir()):
+            commit_hash = view_file.read_text().strip()
+            if commit_hash:
+                refs[f"view '{view_file.name}'"] = commit_hash
+    head_commit = get_head_commit(repo_path)
+    if head_commit and get_current_view_name(repo_path) is None:
+        refs["HEAD"] = head_commit
+    return refs
+
 def get_file_hash_from_last_commit(repo_path: Path, file_path: str) -> Optional[str]:
     """
     Finds the recipe hash for a specific file as it was in the last commit
     of the currently active view (HEAD).
     """
-    head_commit_hash = get_head_commit(repo_path)
-    if not head_commit_hash:
-        return None # No commits in this view yet.
+    return get_commit_file(repo_path, get_head_commit(repo_path), file_path)
 
-    last_manifest = get_manifest(repo_path, head_commit_hash)
-    if not last_manifest: return None
-    
-    dir_recipe_hash = last_manifest.get("recipe")
+def resolve_ref(repo_path: Path, ref: Optional[str] = None) -> Optional[str]:
+    """
+    Resolves a view name, a full commit hash or "HEAD" (the default) to a commit hash.
+    Returns None if the ref is unknown or the view has no commits yet.
+    """
+    if not ref or ref == "HEAD":
+        return get_head_commit(repo_path)
+
+    view_file = repo_path / "refs" / "heads" / ref
+    if view_file.is_file():
+        commit_hash = view_file.read_text().strip()
+        return commit_hash if commit_hash else None
+
+    if get_manifest(repo_path, ref):
+        return ref
+    return None
+
+def _commit_tree(repo_path: Path, commit_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Returns the root directory recipe of a commit."""
+    if not commit_hash:
+        return None
+
+    manifest = get_manifest(repo_path, commit_hash)
+    if not manifest: return None
+
+    dir_recipe_hash = manifest.get("recipe")
     if not dir_recipe_hash: return None
-        
-    dir_recipe = get_recipe(repo_path, dir_recipe_hash)
-    if not dir_recipe: return None
 
-    # The directory recipe's 'files' key holds the mapping from file path to file recipe hash.
-    return dir_recipe.get("files", {}).get(file_path)
+    return get_recipe(repo_path, dir_recipe_hash)
+
+def get_commit_files(repo_path: Path, commit_hash: Optional[str]) -> Dict[str, str]:
+    """Returns the mapping from file path to file recipe hash recorded in a commit."""
+    dir_recipe = _commit_tree(repo_path, commit_hash)
+    return get_tree_files(repo_path, dir_recipe) if dir_recipe else {}
+
+def get_commit_file(repo_path: Path, commit_hash: Optional[str], file_path: str) -> Optional[str]:
+    """Returns the file recipe hash of one path in a commit, reading only the directories on its way."""
+    dir_recipe = _commit_tree(repo_path, commit_hash)
+    return lookup_tree_path(repo_path, dir_recipe, file_path) if dir_recipe else None
+
+# --- DIRECTORY TREES ---
+# A commit's recipe is the root of a Merkle tree of directory recipes:
+#
+#   {"type": "tree", "entries": {name: {"type": "file" | "tree", "recipe": hash}}}
+#
+# File entries point to file recipes and tree entries to the directory recipe
+# of a subdirectory. A commit is built from its parent's tree plus the staged
+# changes, so untouched subtrees are reused by hash: committing costs
+# O(changed paths) and looking up a path O(depth).
+#
+# Commits made before trees existed have a flat recipe, {"files": {path: hash}},
+# which only holds the files staged in that commit. Both shapes are read.
+
+def is_tree(dir_recipe: Dict[str, Any]) -> bool:
+    return dir_recipe.get("type") == "tree"
+
+def _split_path(file_path: str) -> List[str]:
+    return [part for part in file_path.replace("\\", "/").split("/") if part]
+
+def get_tree_files(repo_path: Path, dir_recipe: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+    """Flattens a directory recipe (tree or legacy flat) into a path -> file recipe hash mapping."""
+    if not is_tree(dir_recipe):
+        return dict(dir_recipe.get("files", {}))
 
+    files = {}
+    for name, entry in dir_recipe["entries"].items():
+        path = f"{prefix}{name}"
+        if entry["type"] == "file":
+            files[path] = entry["recipe"]
+            continue
+        subtree = get_recipe(repo_path, entry["recipe"])
+        if subtree is None:
+            raise IOError(f"Missing directory recipe '{entry['recipe']}' for '{path}'.")
+        files.update(get_tree_files(repo_path, subtree, f"{path}/"))
+    return files
+
+def lookup_tree_path(repo_path: Path, dir_recipe: Dict[str, Any], file_path: str) -> Optional[str]:
+    """Finds the file recipe hash of a path in a directory recipe (tree or legacy flat)."""
+    if not is_tree(dir_recipe):
+        return dir_recipe.get("files", {}).get(file_path)
+
+    *directories, file_name = _split_path(file_path) or [""]
+    tree = dir_recipe
+    for name in directories:
+        entry = tree["entries"].get(name)
+        if entry is None or entry["type"] != "tree":
+            return None
+        tree = get_recipe(repo_path, entry["recipe"])
+        if tree is None:
+            return None
+    entry = tree["entries"].get(file_name)
+    return entry["recipe"] if entry and entry["type"] == "file" else None
+
+def _save_tree(repo_path: Path, entries: Dict[str, Dict[str, str]]) -> str:
+    content = json.dumps({"type": "tree", "entries": entries}, sort_keys=True).encode()
+    return save_object(repo_path, content, "recipes")
+
+def _update_tree(repo_path: Path, tree_hash: Optional[str], changes: Dict[Tuple[str, ...], Optional[str]]) -> Optional[str]:
+    """
+    Applies changes (path parts -> file recipe hash, or None to remove) to a
+    tree and returns the new tree hash, or None if the tree ends up empty.
+    Subtrees without changes keep their hash and are never read.
+    """
+    tree = get_recipe(repo_path, tree_hash) if tree_hash else None
+    entries = dict(tree["entries"]) if tree else {}
+
+    subtree_changes: Dict[str, Dict[Tuple[str, ...], Optional[str]]] = {}
+    for parts, file_recipe_hash in changes.items():
+        if len(parts) > 1:
+            subtree_changes.setdefault(parts[0], {})[parts[1:]] = file_recipe_hash
+        elif file_recipe_hash is None:
+            entries.pop(parts[0], None)
+        else:
+            entries[parts[0]] = {"type": "file", "recipe": file_recipe_hash}
+
+    for name, sub_changes in subtree_changes.items():
+        existing = entries.get(name)
+        subtree_hash = existing["recipe"] if existing and existing["type"] == "tree" else None
+        new_subtree_hash = _update_tree(repo_path, subtree_hash, sub_changes)
+        if new_subtree_hash is None:
+            entries.pop(name, None)
+        else:
+            entries[name] = {"type": "tree", "recipe": new_subtree_hash}
+
+    if not entries:
+        return None
+    if tree is not None and entries == tree["entries"]:
+        return tree_hash
+    return _save_tree(repo_path, entries)
+
+def build_tree(repo_path: Path, base_commit: Optional[str], changes: Dict[str, Optional[str]]) -> str:
+    """
+    Builds the directory tree of a new commit from the tree of `base_commit`
+    plus `changes` (path -> file recipe hash, or None to remove the path).
+    Returns the hash of the root directory recipe.
+    """
+    base_tree_hash = None
+    base_recipe = _commit_tree(repo_path, base_commit)
+    if base_recipe is not None:
+        if is_tree(base_recipe):
+            base_tree_hash = get_manifest(repo_path, base_commit)["recipe"]
+        else:
+            # A legacy flat recipe: its files become part of the first tree.
+            changes = {**base_recipe.get("files", {}), **changes}
+
+    parts_changes = {tuple(_split_path(path)): file_recipe_hash for path, file_recipe_hash in changes.items()}
+    root_hash = _update_tree(repo_path, base_tree_hash, parts_changes)
+    return root_hash if root_hash is not None else _save_tree(repo_path, {})
+
+def read_log(repo_path: Path, start_commit: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Collects the commits along the parent chain from `start_commit`, newest
+    first, as dicts with "commit", "message" and "timestamp". Also returns the
+    hash of a commit that could not be found, if the history is corrupted.
+    """
+    entries = []
+    commit_hash = start_commit
+    while commit_hash:
+        manifest = get_manifest(repo_path, commit_hash)
+        if not manifest:
+            return entries, commit_hash
+        entries.append({
+            "commit": commit_hash,
+            "message": manifest.get("message", "No commit message"),
+            "timestamp": manifest.get("timestamp", "No timestamp"),
+        })
+        commit_hash = manifest.get("parent")
+    return entries, None
+
+def iter_history(repo_path: Path, start_commit: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yields (commit hash, manifest) pairs, newest first, following the parent
+    chain from `start_commit`. Stops early if the history is corrupted.
+    """
+    commit_hash = start_commit
+    while commit_hash:
+        manifest = get_manifest(repo_path, commit_hash)
+        if not manifest:
+            break
+        yield commit_hash, manifest
+        commit_hash = manifest.get("parent")
@@ -0,0 +1,224 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from datagit.storage import codec
+
+# --- ZONE MAPS ---
+# Every column recipe carries one statistics entry per chunk:
+#
+#   {"rows": 10000, "nulls": 3, "min": ..., "max": ...}
+#
+# Bounds are stored in a comparable, JSON-friendly form: numbers as-is,
+# temporals and decimals as their physical integer value, and strings (also
+# categoricals/enums) as prefixes of at most STRING_PREFIX_LENGTH characters.
+# A truncated string max is rounded up so it stays an upper bound. Float chunks
+# containing NaN record a "nans" count, since NaN sorts above every number.
+
+STRING_PREFIX_LENGTH = 32
+
+# Comparison operators understood by `chunk_may_match`.
+FILTER_OPS = ("==", "!=", "<", "<=", ">", ">=", "in", "between", "is_null", "is_not_null")
+
+# A filter is a (column, op, value) tuple. All filters in a list must hold (AND).
+Filter = Tuple[str, str, Any]
+
+def comparable_series(series: pl.Series) -> Optional[pl.Series]:
+    """Maps a series onto the representation its bounds are stored in, or None if it has no order."""
+    kind = codec.dtype_to_descriptor(series.dtype)
+    kind = kind if isinstance(kind, str) else kind["type"]
+
+    if kind in ("String", "Categorical", "Enum"):
+        return series.cast(pl.String)
+    if kind in ("Date", "Datetime", "Duration", "Time", "Decimal"):
+        return series.to_physical()
+    if kind in ("Boolean", "Int128") or kind in codec.FIXED_WIDTH_ARROW_TYPES:
+        return series
+    return None
+
+def _round_up_prefix(value: str) -> str:
+    """The smallest string that sorts above every string starting with the truncated prefix."""
+    prefix = value[:STRING_PREFIX_LENGTH]
+    for i in range(len(prefix) - 1, -1, -1):
+        if ord(prefix[i]) < 0x10FFFF:
+            return prefix[:i] + chr(ord(prefix[i]) + 1)
+    return value
+
+def compute_chunk_stats(series: pl.Series) -> Dict[str, Any]:
+    """Computes the zone map entry for a single chunk."""
+    stats: Dict[str, Any] = {"rows": series.len(), "nulls": series.null_count(), "min": None, "max": None}
+
+    comparable = comparable_series(series)
+    if comparable is None:
+        return stats
+
+    if comparable.dtype.is_float():
+        nans = int(comparable.is_nan().sum())
+        if nans:
+            stats["nans"] = nans
+            comparable = comparable.filter(~comparable.is_nan())
+
+    comparable = comparable.drop_nulls()
+    if comparable.len() == 0:
+        return stats
+
+    low, high = comparable.min(), comparable.max()
+    if isinstance(low, float) and (math.isinf(low) or math.isinf(high)):
+        # JSON has no infinities; leave such chunks unbounded.
+        return stats
+    if isinstance(low, str):
+        low = low[:STRING_PREFIX_LENGTH]
+        if len(high) > STRING_PREFIX_LENGTH:
+            high = _round_up_prefix(high)
+
+    stats["min"], stats["max"] = low, high
+    return stats
+
+def to_stat_value(value: Any, dtype: pl.DataType) -> Any:
+    """
+    Converts a filter literal into the representation bounds are stored in for
+    `dtype`. Returns None when that isn't possible, which disables pruning.
+    """
+    if value is None:
+        return None
+    try:
+        original = pl.Series([value])
+        target = pl.String if dtype.base_type() in (pl.Categorical, pl.Enum) else dtype
+        if original.dtype == pl.String and target.base_type() in (pl.Date, pl.Datetime, pl.Time):
+            literal = original.str.strptime(target, strict=False)
+        else:
+            literal = original.cast(target, strict=False)
+            # A lossy conversion (e.g. 2.5 -> 2) would make the bound comparisons unsound.
+            if not literal.cast(original.dtype, strict=False).equals(original):
+                return None
+    except Exception:
+        return None
+
+    comparable = comparable_series(literal)
+    if comparable is None or comparable.null_count():
+        return None
+    return comparable.item()
+
+def chunk_may_match(stats: Dict[str, Any], op: str, value: Any) -> bool:
+    """
+    Tells whether any row of a chunk can satisfy `column <op> value`. Bounds are
+    only ever used to rule chunks out, so an unknown answer is always True.
+    """
+    rows, nulls = stats.get("rows"), stats.get("nulls")
+    if rows is None or nulls is None:
+        return True
+
+    if op == "is_null":
+        return nulls > 0
+    if op == "is_not_null":
+        return nulls < rows
+    if nulls == rows:
+        # Comparisons against null are never true.
+        return False
+
+    low, high = stats.get("min"), stats.get("max")
+    if low is None or value is None:
+        return True
+    if stats.get("nans"):
+        high = None
+
+    try:
+        if op == "==":
+            return low <= value and (high is None or value <= high)
+        if op == "in":
+            return any(low <= v and (high is None or v <= high) for v in value if v is not None)
+        if op == "between":
+            lower, upper = value
+            return (high is None or lower is None or high >= lower) and (upper is None or low <= upper)
+        if op in ("<", "<="):
+            return low < value if op == "<" else low <= value
+        if op in (">", ">="):
+            return high is None or (high > value if op == ">" else high >= value)
+    except TypeError:
+        return True
+    return True
+
+def select_chunks(column_recipes: Dict[str, Dict[str, Any]], filters: Sequence[Filter], chunk_count: int) -> List[int]:
+    """Returns the indices of the chunks whose statistics don't rule out the filters."""
+    prepared = []
+    for column, op, value in filters:
+        recipe = column_recipes.get(column, {})
+        if op in ("is_null", "is_not_null"):
+            prepared.append((recipe.get("stats"), op, value))
+            continue
+        if "dtype" not in recipe:
+            continue
+
+        dtype = codec.dtype_from_descriptor(recipe["dtype"])
+        if op in ("in", "between"):
+            converted = [to_stat_value(v, dtype) for v in value]
+            if op == "in" and any(v is None for v in converted):
+                continue
+        else:
+            converted = to_stat_value(value, dtype)
+        prepared.append((recipe.get("stats"), op, converted))
+
+    selected = []
+    for i in range(chunk_count):
+        if all(
+            chunk_stats is None or i >= len(chunk_stats) or chunk_may_match(chunk_stats[i], op, value)
+            for chunk_stats, op, value in prepared
+        ):
+            selected.append(i)
+    return selected
+
+def _literal_series(value: Any, dtype: Optional[pl.DataType]) -> pl.Series:
+    """
+    A one-element series holding `value` converted to `dtype`; temporal strings
+    are parsed. A value the conversion would change (e.g. 2.5 for an integer
+    column) keeps its own type, so the comparison happens in the supertype.
+    """
+    literal = pl.Series([value])
+    if dtype is None:
+        return literal
+    if literal.dtype == pl.String and dtype.base_type() in (pl.Date, pl.Datetime, pl.Time):
+        return literal.str.strptime(dtype)
+    converted = literal.cast(dtype, strict=False)
+    if not converted.cast(literal.dtype, strict=False).equals(literal):
+        return literal
+    return converted
+
+def _literal(value: Any, dtype: Optional[pl.DataType]) -> pl.Expr:
+    return pl.lit(_literal_series(value, dtype)).first()
+
+def filter_expression(filters: Iterable[Filter], schema: Dict[str, pl.DataType]) -> Optional[pl.Expr]:
+    """Builds the exact Polars predicate for a list of filters."""
+    expr = None
+    for column, op, value in filters:
+        col = pl.col(column)
+        dtype = schema.get(column)
+        lit = lambda v: _literal(v, dtype)
+
+        if op == "is_null":
+            term = col.is_null()
+        elif op == "is_not_null":
+            term = col.is_not_null()
+        elif op == "in":
+            # A value that doesn't convert to the column's type can't equal any of its values.
+            values = [s for s in (_literal_series(v, dtype) for v in value) if dtype is None or s.dtype == dtype]
+            candidates = pl.concat(values) if values else pl.Series([], dtype=dtype or pl.Null)
+            term = col.is_in(pl.lit(candidates).implode())
+        elif op == "between":
+            term = col.is_between(lit(value[0]), lit(value[1]))
+        elif op == "==":
+            term = col == lit(value)
+        elif op == "!=":
+            term = col != lit(value)
+        elif op == "<":
+            term = col < lit(value)
+        elif op == "<=":
+            term = col <= lit(value)
+        elif op == ">":
+            term = col > lit(value)
+        elif op == ">=":
+            term = col >= lit(value)
+        else:
+            raise ValueError(f"Unknown filter operator: {op}")
+        expr = term if expr is None else expr & term
+    return expr
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from datagit.storage import metadata, repository
+
+# --- WORKING TREE STATE ---
+# Comparing the working directory, the index and HEAD. Used by `status` and
+# `add` directly and by the daemon, which supplies its own cached file listing
+# and file hashes.
+
+IGNORE_DIRS = {".datagit", ".git", "__pycache__", ".DS_Store"}
+
+def is_ignored(relative_path: str) -> bool:
+    """Tells whether a path (relative to the repository root) is never tracked."""
+    parts = Path(relative_path).parts
+    return any(part in IGNORE_DIRS for part in parts[:-1]) or (bool(parts) and parts[-1].startswith("."))
+
+def list_working_files(repo_root: Path) -> Set[str]:
+    """
+    Recursively finds all files in the repository to capture the 'Working Directory' state.
+    """
+    all_files = set()
+    for root, dirs, files in os.walk(repo_root):
+        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        for file in files:
+            if file.startswith("."): continue
+            all_files.add(str((Path(root) / file).relative_to(repo_root)))
+    return all_files
+
+def hash_working_file(repo_path: Path, relative_file_path: str) -> str:
+    """Builds the Merkle tree of a working file and returns its file recipe hash."""
+    # Deferred import: only hashing a working file needs the data libraries,
+    # so a status with nothing to hash starts fast.
+    from datagit.storage import core
+    return core.construct_merkle_tree_for_file(repo_path, repo_path.parent / relative_file_path, relative_file_path)
+
+def compute_status(
+    repo_path: Path,
+    working_files: Optional[Iterable[str]] = None,
+    hash_file: Optional[Callable[[str], str]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Compares the working directory, the index and HEAD. Returns the lists
+    `staged` (entries like "new file:   a.csv"), `unstaged`, `deleted`,
+    `untracked` and `unreadable` (tracked files that could not be hashed).
+    """
+    if working_files is None:
+        working_files = list_working_files(repo_path.parent)
+    working_files = set(working_files)
+    if hash_file is None:
+        hash_file = lambda path: hash_working_file(repo_path, path)
+
+    # State A: Staging Area (Index); State B: HEAD Commit (The "Truth" of history)
+    index = metadata.load_index(repo_path)
+    head_files = repository.get_commit_files(repo_path, repository.get_head_commit(repo_path))
+
+    status: Dict[str, List[str]] = {"staged": [], "unstaged": [], "deleted": [], "untracked": [], "unreadable": []}
+
+    # A. Check Working Directory vs. Known State
+    for file_path_str in sorted(working_files):
+        if file_path_str not in index and file_path_str not in head_files:
+            status["untracked"].append(file_path_str)
+            continue
+
+        # It is tracked. We must hash it to see if it changed.
+        try:
+            current_hash = hash_file(file_path_str)
+        except Exception:
+            status["unreadable"].append(file_path_str)
+            continue
+
+        # The staging area takes precedence over HEAD.
+        expected_hash = index.get(file_path_str, head_files.get(file_path_str))
+        if current_hash != expected_hash:
+            status["unstaged"].append(file_path_str)
+
+    # B. Check for Deleted Files & Staged Changes
+    for file_path_str in sorted(set(index) | set(head_files)):
+        if file_path_str not in working_files:
+            status["deleted"].append(file_path_str)
+            continue
+        if file_path_str in index:
+            if file_path_str not in head_files:
+                status["staged"].append(f"new file:   {file_path_str}")
+            elif index[file_path_str] != head_files[file_path_str]:
+                status["staged"].append(f"modified:   {file_path_str}")
+    return status
+
+def stage_file(repo_path: Path, file_path: Path, hash_file: Optional[Callable[[str], str]] = None) -> Tuple[str, str, bool]:
+    """
+    Versions a working file and stages it if it differs from the last commit.
+    Returns (relative path, file recipe hash, whether it was staged). Raises
+    IOError if the file can't be read.
+    """
+    # Use a relative path for consistent tracking within the repository.
+    # This is critical for the schema cache to work correctly.
+    relative_file_path = str(file_path.resolve().relative_to(repo_path.parent.resolve()))
+    if hash_file is None:
+        new_file_hash = hash_working_file(repo_path, relative_file_path)
+    else:
+        new_file_hash = hash_file(relative_file_path)
+
+    # If the root of the new Merkle tree is identical to the old one, no data has changed.
+    old_file_hash = repository.get_file_hash_from_last_commit(repo_path, relative_file_path)
+    if new_file_hash == old_file_hash:
+        return relative_file_path, new_file_hash, False
+
+    index = metadata.load_index(repo_path)
+    index[relative_file_path] = new_file_hash
+    metadata.save_index(repo_path, index)
+    return relative_file_path, new_file_hash, True
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import polars as pl
+
+from datagit.storage import delta, objects, repository
+
+ROWS = 25_000
+MAX_DEPTH = 2
+VERSIONS = 5
+
+def datagit(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "datagit.cli.main", *args], cwd=repo, capture_output=True, text=True
+    )
+
+def write_version(path: Path, version: int) -> None:
+    # Every version changes one cell of the first chunk.
+    values = [i * 2 for i in range(ROWS)]
+    values[3] = -version
+    path.write_text("id,v\n" + "".join(f"{i},{v}\n" for i, v in enumerate(values)))
+
+def chunk_depths(repo_path: Path, commit_hash: str) -> list:
+    store = objects.get_object_store(repo_path)
+    file_recipe = repository.get_recipe(repo_path, repository.get_commit_file(repo_path, commit_hash, "data.csv"))
+    column = next(c for c in file_recipe["columns"] if c["name"] == "v")
+    return [delta.chunk_depth(store.get("chunk", h)) for h in repository.get_recipe(repo_path, column["recipe"])["chunks"]]
+
+def test_delta_chains_are_capped_and_old_commits_restore(tmp_path):
+    assert datagit(tmp_path, "init").returncode == 0
+    assert datagit(tmp_path, "config", "delta_chunks.enabled", "true").returncode == 0
+    assert datagit(tmp_path, "config", "delta_chunks.max_depth", str(MAX_DEPTH)).returncode == 0
+    repo_path = tmp_path / ".datagit"
+    data = tmp_path / "data.csv"
+
+    commits = []
+    for version in range(VERSIONS):
+        write_version(data, version)
+        assert datagit(tmp_path, "add", "data.csv").returncode == 0
+        assert datagit(tmp_path, "commit", "-m", f"version {version}").returncode == 0
+        commits.append(repository.get_head_commit(repo_path))
+
+    # The first chunk of v: full, then deltas up to the cap, then full again.
+    first_chunk_depths = [chunk_depths(repo_path, commit_hash)[0] for commit_hash in commits]
+    assert first_chunk_depths == [0, 1, 2, 0, 1]
+    # Untouched chunks are shared, never re-stored as deltas.
+    assert all(depths[1:] == [0, 0] for depths in (chunk_depths(repo_path, c) for c in commits))
+
+    for version, commit_hash in enumerate(commits):
+        assert datagit(tmp_path, "activate", commit_hash).returncode == 0
+        restored = pl.read_csv(data)
+        assert restored.height == ROWS
+        assert restored["v"][3] == -version
+        assert restored["v"][4] == 8
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+def datagit(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "datagit.cli.main", *args], cwd=repo, capture_output=True, text=True
+    )
+
+def test_staged_files_are_not_dangling(tmp_path):
+    assert datagit(tmp_path, "init").returncode == 0
+    (tmp_path / "data.csv").write_text("id,v\n1,2\n3,4\n")
+    assert datagit(tmp_path, "add", "data.csv").returncode == 0
+    assert datagit(tmp_path, "commit", "-m", "first").returncode == 0
+    (tmp_path / "data.csv").write_text("id,v\n1,2\n3,5\n")
+    (tmp_path / "more.csv").write_text("k\nx\n")
+    assert datagit(tmp_path, "add", "data.csv").returncode == 0
+    assert datagit(tmp_path, "add", "more.csv").returncode == 0
+
+    result = datagit(tmp_path, "fsck")
+    assert result.returncode == 0
+    assert "dangling" not in result.stdout
@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+def datagit(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "datagit.cli.main", *args], cwd=repo, capture_output=True, text=True
+    )
+
+def rows(start: int, stop: int) -> str:
+    return "".join(f"{i},{i * 2},name-{i % 7}\n" for i in range(start, stop))
+
+def staged_recipe(repo: Path) -> str:
+    return json.loads((repo / ".datagit" / "index.json").read_text())["data.csv"]
+
+def fresh_recipe(tmp_path: Path, content: str, schema: dict) -> str:
+    """Ingests `content` in a new repository, with the same schema as the incremental one."""
+    repo = tmp_path / f"fresh-{len(list(tmp_path.iterdir()))}"
+    repo.mkdir()
+    assert datagit(repo, "init").returncode == 0
+    (repo / ".datagit" / "schemas.json").write_text(json.dumps(schema))
+    (repo / "data.csv").write_text(content)
+    assert datagit(repo, "add", "data.csv").returncode == 0
+    return staged_recipe(repo)
+
+def test_append_only_ingest_matches_a_full_ingest(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    assert datagit(repo, "init").returncode == 0
+    data = repo / "data.csv"
+    content = "id,v,name\n" + rows(0, 25_000)
+    data.write_text(content)
+    assert datagit(repo, "add", "data.csv").returncode == 0
+    schema = json.loads((repo / ".datagit" / "schemas.json").read_text())
+
+    steps = [
+        # (what is written, whether the append fast path applies)
+        (rows(25_000, 25_010), True),          # into the partial last chunk
+        (rows(25_010, 30_000), True),          # up to an exact chunk boundary
+        (rows(30_000, 30_003), True),          # past the boundary
+        ("30003,60006,name-last", True),       # no trailing newline
+        ("9\n" + rows(30_004, 30_005), True),  # completes the unterminated line
+    ]
+    for appended, fast in steps:
+        content += appended
+        data.write_text(content)
+        result = datagit(repo, "add", "data.csv")
+        assert result.returncode == 0
+        assert ("Appended rows" in result.stdout) == fast
+        assert staged_recipe(repo) == fresh_recipe(tmp_path, content, schema)
+
+    # An edit before the end is not an append.
+    content = content.replace("\n5,10,", "\n5,11,", 1)
+    data.write_text(content)
+    result = datagit(repo, "add", "data.csv")
+    assert result.returncode == 0
+    assert "Appended rows" not in result.stdout
+    assert staged_recipe(repo) == fresh_recipe(tmp_path, content, schema)
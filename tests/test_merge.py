@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from datagit.storage import repository
+
+ROWS = 25_000
+
+def datagit(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "datagit.cli.main", *args], cwd=repo, capture_output=True, text=True
+    )
+
+def write_rows(path: Path, rows: int, with_w: bool = False) -> None:
+    header = "id,v,w" if with_w else "id,v"
+    lines = [f"{i},{i * 2},{i * 3}" if with_w else f"{i},{i * 2}" for i in range(rows)]
+    path.write_text(header + "\n" + "\n".join(lines) + "\n")
+
+def commit(repo: Path, message: str) -> None:
+    assert datagit(repo, "add", "data.csv").returncode == 0
+    assert datagit(repo, "commit", "-m", message).returncode == 0
+
+def test_append_on_one_side_and_new_column_on_the_other_conflicts(tmp_path):
+    assert datagit(tmp_path, "init").returncode == 0
+    data = tmp_path / "data.csv"
+    write_rows(data, ROWS)
+    commit(tmp_path, "base")
+    assert datagit(tmp_path, "view", "other").returncode == 0
+
+    # main adds a column, other appends rows.
+    write_rows(data, ROWS, with_w=True)
+    commit(tmp_path, "add column w")
+    assert datagit(tmp_path, "activate", "other").returncode == 0
+    write_rows(data, ROWS + 100)
+    commit(tmp_path, "append rows")
+    assert datagit(tmp_path, "activate", "main").returncode == 0
+
+    main_head = (tmp_path / ".datagit" / "refs" / "heads" / "main").read_text()
+    result = datagit(tmp_path, "merge", "other")
+
+    assert result.returncode == 1
+    assert "Merge aborted" in result.stdout
+    # The view didn't move and the aborted merge left no objects behind.
+    assert (tmp_path / ".datagit" / "refs" / "heads" / "main").read_text() == main_head
+    fsck = datagit(tmp_path, "fsck")
+    assert fsck.returncode == 0
+    assert "dangling" not in fsck.stdout
+
+def test_files_deleted_on_the_other_side_leave_the_working_tree(tmp_path):
+    assert datagit(tmp_path, "init").returncode == 0
+    repo_path = tmp_path / ".datagit"
+    write_rows(tmp_path / "data.csv", 10)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "gone.csv").write_text("k\n1\n")
+    assert datagit(tmp_path, "add", "sub/gone.csv").returncode == 0
+    commit(tmp_path, "base")
+    assert datagit(tmp_path, "view", "other").returncode == 0
+
+    # There is no command that removes a tracked file, so `other` drops it directly.
+    other = (repo_path / "refs" / "heads" / "other").read_text().strip()
+    manifest = {
+        "parent": other,
+        "message": "remove sub/gone.csv",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "recipe": repository.build_tree(repo_path, other, {"sub/gone.csv": None}),
+    }
+    removed = repository.save_object(repo_path, json.dumps(manifest, sort_keys=True).encode(), "manifests")
+    (repo_path / "refs" / "heads" / "other").write_text(removed)
+
+    # main changes something else, so the merge is a real three-way merge.
+    write_rows(tmp_path / "data.csv", 20)
+    commit(tmp_path, "more rows")
+    result = datagit(tmp_path, "merge", "other")
+
+    assert result.returncode == 0, result.stdout
+    assert not (tmp_path / "sub").exists()
+    assert (tmp_path / "data.csv").exists()
+    assert "untracked" not in datagit(tmp_path, "status").stdout.lower()
@@ -0,0 +1,23 @@
+import polars as pl
+
+from datagit.storage import stats
+
+def apply(df: pl.DataFrame, *filters) -> pl.DataFrame:
+    return df.filter(stats.filter_expression(filters, df.schema))
+
+def test_float_literal_on_int_column_is_not_truncated():
+    df = pl.DataFrame({"price": [1, 2, 3]})
+
+    assert apply(df, ("price", "<", 2.5))["price"].to_list() == [1, 2]
+    assert apply(df, ("price", ">", 1.5))["price"].to_list() == [2, 3]
+    assert apply(df, ("price", "==", 2.5)).height == 0
+    assert apply(df, ("price", "==", 2.0))["price"].to_list() == [2]
+    assert apply(df, ("price", "between", (1.5, 2.5)))["price"].to_list() == [2]
+    assert apply(df, ("price", "in", [2.5, 3]))["price"].to_list() == [3]
+
+def test_float_literal_on_int_column_disables_pruning():
+    df = pl.DataFrame({"price": [1, 2, 3]})
+    recipe = {"dtype": "Int64", "stats": [stats.compute_chunk_stats(df["price"])]}
+
+    assert stats.select_chunks({"price": recipe}, [("price", "<", 2.5)], 1) == [0]
+    assert stats.select_chunks({"price": recipe}, [("price", ">", 3)], 1) == []